@@ -0,0 +1,51 @@
+import os
+import sys
+
+from sqlalchemy import create_engine, text
+
+# Query plans of the hot lookups, run before and after `alembic upgrade head` to compare:
+#   python benchmark_query_plans.py before   ->  reports/query_plans_before.md
+#   python benchmark_query_plans.py after    ->  reports/query_plans_after.md
+QUERIES = {
+    "prayer_times by masjid and date": (
+        "SELECT * FROM prayer_times WHERE masjid_id = :masjid_id AND date >= current_date ORDER BY date LIMIT 1"
+    ),
+    "prayer_times month range": (
+        "SELECT * FROM prayer_times WHERE masjid_id = :masjid_id "
+        "AND date BETWEEN current_date AND current_date + 30 ORDER BY date"
+    ),
+    "location by masjid": "SELECT * FROM locations WHERE masjid_id = :masjid_id",
+    "facilities by masjid": "SELECT * FROM facilities WHERE masjid_id = :masjid_id",
+    "announcements by masjid": "SELECT * FROM announcements WHERE masjid_id = :masjid_id",
+    "special_prayers by masjid": "SELECT * FROM special_prayers WHERE masjid_id = :masjid_id",
+    "logs by masjid, newest first": (
+        "SELECT * FROM logs WHERE masjid_id = :masjid_id ORDER BY action_time DESC LIMIT 50"
+    ),
+    "user by email": "SELECT * FROM users WHERE email = :email",
+    "config option": "SELECT * FROM config WHERE config_option = 'hijri_adjustment'",
+}
+
+label = sys.argv[1] if len(sys.argv) > 1 else "current"
+url = os.getenv("DATABASE_URL")
+assert url, "DATABASE_URL is not set"
+engine = create_engine(url)
+
+with engine.connect() as connection:
+    # Benchmark against the masjid with the most prayer times
+    masjid_id = connection.execute(text(
+        "SELECT masjid_id FROM prayer_times GROUP BY masjid_id ORDER BY count(*) DESC LIMIT 1"
+    )).scalar()
+    email = connection.execute(text("SELECT email FROM users LIMIT 1")).scalar()
+
+    report = [f"# Query plans ({label})\n"]
+    for name, query in QUERIES.items():
+        plan = connection.execute(
+            text(f"EXPLAIN (ANALYZE, BUFFERS) {query}"),
+            {"masjid_id": masjid_id, "email": email},
+        ).scalars().all()
+        report.append(f"## {name}\n\n```\n{query}\n\n" + "\n".join(plan) + "\n```\n")
+
+output = f"reports/query_plans_{label}.md"
+with open(output, "w") as f:
+    f.write("\n".join(report))
+print(f"Wrote {output}")
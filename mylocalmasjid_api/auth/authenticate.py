@@ -1,3 +1,6 @@
+import hashlib
+import time
+import uuid
 from datetime import datetime, timedelta
 from json import loads
 from types import SimpleNamespace
@@ -8,10 +11,11 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jwt import exceptions
 from sqlmodel import Session
 
-from mylocalmasjid_api.auth.models import User
-from mylocalmasjid_api.auth.utils import get_user
+from mylocalmasjid_api.auth.models import User, UserRole
+from mylocalmasjid_api.auth.utils import get_cached_user
 from mylocalmasjid_api.config import settings
 from mylocalmasjid_api.database import get_session
+from mylocalmasjid_api.utils.cache import LRUCache
 from mylocalmasjid_api.utils.logger import logger_config
 
 security = HTTPBearer()
@@ -20,12 +24,22 @@ secret = settings.SECRET_KEY
 access_token_expire = settings.ACCESS_TOKEN_EXPIRE
 refresh_token_expire = settings.REFRESH_TOKEN_EXPIRE
 
+# Version of the token claims, 2 replaced the serialized user in iss with sub/typ/role/masjid
+TOKEN_VERSION = 2
+
+# sha256 of an access token -> User decoded from it, each entry expiring with its token
+token_cache = LRUCache(maxsize=max(settings.AUTH_TOKEN_CACHE_SIZE, 1), name="access_tokens")
+
 logger = logger_config(__name__)
 
 def encode_token(user: User, type: str):
+    # Only the claims needed to identify the user, keeping the Authorization header small
     payload = dict(
-        iss = user.model_dump_json(),
-        sub = type
+        sub = str(user.id),
+        typ = type,
+        role = user.role,
+        masjid = str(user.related_masjid) if user.related_masjid else None,
+        ver = TOKEN_VERSION,
     )
     to_encode = payload.copy()
     if type == "access_token":
@@ -54,26 +68,55 @@ def encode_update_token(user: User):
     return update_token
 
 
-def decode_access_token(token: str) -> User:
-    try:
-        payload = jwt.decode(token, secret, algorithms=['HS256'])
-        if payload['sub'] != "access_token":
+def user_from_claims(payload: dict, type: str) -> User:
+    """
+    User carrying the id, role and masjid of a verified token. The claims are signed,
+    so the user is built without model validation.
+    """
+    if "typ" not in payload:
+        # Tokens issued before TOKEN_VERSION 2 hold the serialized user in iss
+        if payload['sub'] != type:
             raise HTTPException(status_code=401, detail='Invalid token')
         json_t= loads(payload['iss'], object_hook=lambda d: SimpleNamespace(**d))
-        logger.info("%s.decode_access_token: %s", __name__, json_t)
         return User.model_validate(json_t, from_attributes=True)
+
+    if payload['typ'] != type:
+        raise HTTPException(status_code=401, detail='Invalid token')
+    try:
+        return User.model_construct(
+            id=uuid.UUID(payload['sub']),
+            role=UserRole(payload['role']),
+            related_masjid=uuid.UUID(payload['masjid']) if payload.get('masjid') else None,
+        )
+    except (KeyError, ValueError):
+        raise HTTPException(status_code=401, detail='Invalid token')
+
+
+def decode_access_token(token: str) -> User:
+    if settings.AUTH_TOKEN_CACHE_SIZE:
+        digest = hashlib.sha256(token.encode()).digest()
+        user = token_cache.get(digest)
+        if user is not None:
+            return user
+
+    try:
+        payload = jwt.decode(token, secret, algorithms=['HS256'])
+        logger.info("%s.decode_access_token: %s", __name__, payload['sub'])
+        user = user_from_claims(payload, "access_token")
     except exceptions.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail='Signature has expired')
     except exceptions.InvalidTokenError as e:
         raise HTTPException(status_code=401, detail='Invalid token')
 
+    if settings.AUTH_TOKEN_CACHE_SIZE:
+        # jwt.decode has already rejected expired tokens, so the ttl is positive
+        token_cache.set(digest, user, ttl=payload['exp'] - time.time())
+    return user
+
 def decode_refresh_token(token) -> User:
     try:
         payload = jwt.decode(token, secret, algorithms=['HS256'])
-        if payload['sub'] != "refresh_token":
-            raise HTTPException(status_code=401, detail='Invalid token')
-        json_t= loads(payload['iss'], object_hook=lambda d: SimpleNamespace(**d))
-        return User.model_validate(json_t, from_attributes=True)
+        return user_from_claims(payload, "refresh_token")
     except exceptions.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail='Signature has expired')
     except exceptions.InvalidTokenError as e:
@@ -85,8 +128,7 @@ def auth_access_wrapper(
         db: Session = Depends(get_session)
     ):
     user_obj = decode_access_token(auth.credentials)
-    user = get_user(user_obj.id, db=db)
-    return user
+    return get_cached_user(user_obj.id, db=db)
 
 
 
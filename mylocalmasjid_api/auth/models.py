@@ -3,6 +3,7 @@ import uuid
 from typing import Optional
 
 from pydantic import BaseModel
+from sqlalchemy import Index
 from sqlmodel import Column, Enum, Field, SQLModel
 
 
@@ -23,6 +24,9 @@ class UserBase(SQLModel):
 class User(UserBase, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     hashed_password: str
+    __table_args__ = (
+        Index("uq_users_email", "email", unique=True),
+    )
 
 
 class UserRead(UserBase):
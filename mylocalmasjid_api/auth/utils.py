@@ -1,13 +1,41 @@
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 import bcrypt
 from sqlmodel import Session, select
 
 from mylocalmasjid_api.auth.models import User, UserCreate, UserUpdate
+from mylocalmasjid_api.config import settings
 from mylocalmasjid_api.database import get_session
+from mylocalmasjid_api.utils.cache import LRUCache
+
+# user id -> detached copy of the user, for authenticating requests
+user_cache = LRUCache(maxsize=1024, ttl=settings.AUTH_USER_CACHE_TTL, name="users")
+
+# bcrypt runs on its own small pool (it releases the GIL) so login bursts cannot take
+# every request thread. Checks beyond the workers plus PASSWORD_HASH_QUEUE get a 429.
+password_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+_password_slots = threading.BoundedSemaphore(settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE)
 
 # oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+def run_password_task(fn, *args):
+    """Runs a bcrypt call on password_executor, raising 429 when its queue is full."""
+    if not _password_slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Too many password checks in progress, try again shortly",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        return password_executor.submit(fn, *args).result()
+    finally:
+        _password_slots.release()
+
+
 def verify_password(plain_password: str, hashed_password: str):
     # encoding user password 
     userBytes = plain_password.encode('utf-8')
@@ -15,7 +43,7 @@ def verify_password(plain_password: str, hashed_password: str):
     hashBytes = hashed_password.encode('utf-8')
     
     # checking password 
-    return bcrypt.checkpw(userBytes, hashBytes)
+    return run_password_task(bcrypt.checkpw, userBytes, hashBytes)
 
 
 def get_password_hash(password: str):
@@ -23,10 +51,18 @@ def get_password_hash(password: str):
     bytes = password.encode('utf-8')
   
     # generating the salt 
-    salt = bcrypt.gensalt() 
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
     
     # Hashing the password 
-    return bcrypt.hashpw(bytes, salt).decode('utf-8')
+    return run_password_task(bcrypt.hashpw, bytes, salt).decode('utf-8')
+
+
+def needs_rehash(hashed_password: str):
+    # bcrypt hashes look like $2b$<rounds>$<salt and hash>
+    try:
+        return int(hashed_password.split("$")[2]) != settings.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return False
 
 
 def get_user(id: str, db: Session = Depends(get_session), allow_disabled: bool = False):
@@ -45,6 +81,28 @@ def get_user(id: str, db: Session = Depends(get_session), allow_disabled: bool =
 
     return user
 
+def get_cached_user(id, db: Session):
+    """
+    User for an authenticated request, read through user_cache so bursts of requests
+    with the same token skip the users lookup. Disabled users are still rejected, at
+    most AUTH_USER_CACHE_TTL seconds after the change on other processes.
+    """
+    if not settings.AUTH_USER_CACHE_TTL:
+        return get_user(id, db=db)
+
+    user = user_cache.get(id)
+    if user is None:
+        # Copy so the cached user is not expired by commits on this request's session
+        user = User.model_validate(get_user(id, db=db))
+        user_cache.set(user.id, user)
+    return user
+
+
+def invalidate_user(id):
+    """Drops a user from user_cache after their details or password change."""
+    user_cache.pop(uuid.UUID(id) if isinstance(id, str) else id)
+
+
 def get_available_users(user: User, db: Session = Depends(get_session)):
     if user.role == "admin":
         return db.exec(select(User)).all()
@@ -108,8 +166,14 @@ def authenticate_user(email: str, password: str, db: Session = Depends(get_sessi
         return False
     # if user.active is False:
     #     return False
-    
-    print(verify_password(password, user.hashed_password))
+
+    # Move the hash to the current BCRYPT_ROUNDS while the password is at hand
+    if needs_rehash(user.hashed_password):
+        user.hashed_password = get_password_hash(password)
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        invalidate_user(user.id)
     return user
 
 
@@ -148,6 +212,7 @@ def change_user_password(id: str, password: str, db: Session = Depends(get_sessi
     db.add(user)
     db.commit()
     db.refresh(user)
+    invalidate_user(user.id)
     return user
 
 
@@ -182,4 +247,5 @@ def update_user(id: str, user: UserUpdate, requesting_user: User, db: Session =
     db.add(user_to_update)
     db.commit()
     db.refresh(user_to_update)
+    invalidate_user(user_to_update.id)
     return user_to_update
\ No newline at end of file
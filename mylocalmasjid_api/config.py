@@ -11,8 +11,26 @@ class Settings(BaseSettings):
     ENV: Literal["development", "staging", "production"] = os.getenv("API_ENV", "development")
     DATABASE_URI: str =  os.getenv("DATABASE_URL", "not_set")
     SECRET_KEY: str =  os.getenv("SECRET_KEY", "not_so_secret")
+    # pooled for long running servers, external for Lambda behind PgBouncer/RDS Proxy
+    DB_POOL_MODE: Literal["pooled", "external"] = os.getenv("DB_POOL_MODE", "pooled")
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", 30)) # seconds to wait for a connection
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", 1800)) # seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
     ACCESS_TOKEN_EXPIRE: int = 1800 # seconds (30 minutes)
     REFRESH_TOKEN_EXPIRE: int = 604800 # seconds (7 days)
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", 12)) # work factor, hashes with another factor are redone on login
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", 2)) # threads hashing and checking passwords
+    PASSWORD_HASH_QUEUE: int = int(os.getenv("PASSWORD_HASH_QUEUE", 8)) # waiting password checks before answering 429
+    AUTH_TOKEN_CACHE_SIZE: int = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", 2048)) # decoded access tokens held, 0 disables
+    AUTH_USER_CACHE_TTL: int = int(os.getenv("AUTH_USER_CACHE_TTL", 60)) # seconds, 0 loads the user on every request
+    HTTP_CACHE_MAX_AGE: int = int(os.getenv("HTTP_CACHE_MAX_AGE", 300)) # seconds
+    HTTP_CACHE_STALE_WHILE_REVALIDATE: int = int(os.getenv("HTTP_CACHE_STALE_WHILE_REVALIDATE", 3600)) # seconds
+    MASJID_CACHE_TTL: int = int(os.getenv("MASJID_CACHE_TTL", 300)) # seconds
+    CONFIG_SNAPSHOT_TTL: int = int(os.getenv("CONFIG_SNAPSHOT_TTL", 300)) # seconds before config options are reloaded
+    LOCATION_INDEX_TTL: int = int(os.getenv("LOCATION_INDEX_TTL", 900)) # seconds before the nearest masjid index is reloaded
+    HIJRI_LOOKUP_YEARS: int = int(os.getenv("HIJRI_LOOKUP_YEARS", 5)) # years either side of today, 0 disables
 
     class Config:
         case_sensitive = True
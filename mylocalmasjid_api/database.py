@@ -1,8 +1,35 @@
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from mylocalmasjid_api.config import settings
+from mylocalmasjid_api.utils.db_pool import engine_options
 
-engine = create_engine(settings.DATABASE_URI, echo=True)
+# Database backend -> async driver used for the async engine
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_uri(database_uri: str) -> str:
+    """Swaps the driver of a database URI for its async equivalent."""
+    url = make_url(database_uri)
+    if url.get_backend_name() == "postgresql" and "sslmode" in url.query:
+        # asyncpg takes ssl instead of libpq's sslmode
+        url = url.difference_update_query(["sslmode"]).update_query_dict({"ssl": url.query["sslmode"]})
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername)).render_as_string(
+        hide_password=False
+    )
+
+
+engine = create_engine(settings.DATABASE_URI, echo=True, **engine_options(settings.DATABASE_URI))
+async_engine = create_async_engine(
+    async_database_uri(settings.DATABASE_URI),
+    echo=True,
+    **engine_options(async_database_uri(settings.DATABASE_URI), asynchronous=True),
+)
 
 
 def create_db_and_tables():
@@ -12,3 +39,9 @@ def create_db_and_tables():
 def get_session():
     with Session(engine) as session:
         yield session
+
+
+async def get_async_session():
+    # Objects stay usable after commit, async sessions cannot lazy load expired attributes
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
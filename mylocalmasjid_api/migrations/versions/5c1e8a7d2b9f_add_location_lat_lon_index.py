@@ -0,0 +1,40 @@
+"""add_location_lat_lon_index
+
+Revision ID: 5c1e8a7d2b9f
+Revises: 31adf26c4b24
+Create Date: 2026-10-18 15:30:12.418203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = '5c1e8a7d2b9f'
+down_revision = '31adf26c4b24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY does not lock out writes but cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_locations_latitude_longitude',
+            'locations',
+            ['latitude', 'longitude'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_locations_latitude_longitude',
+            table_name='locations',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,43 @@
+"""add_masjid_search_trigram_index
+
+Revision ID: 9e4b6d2a7c13
+Revises: 5c1e8a7d2b9f
+Create Date: 2026-10-18 15:41:37.902114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision = '9e4b6d2a7c13'
+down_revision = '5c1e8a7d2b9f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_masjids_search_trgm',
+            'masjids',
+            ['name', 'type', 'locale', 'madhab'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={
+                'name': 'gin_trgm_ops',
+                'type': 'gin_trgm_ops',
+                'locale': 'gin_trgm_ops',
+                'madhab': 'gin_trgm_ops',
+            },
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_masjids_search_trgm', table_name='masjids', postgresql_concurrently=True, if_exists=True)
+    # pg_trgm is left installed, other objects may depend on it
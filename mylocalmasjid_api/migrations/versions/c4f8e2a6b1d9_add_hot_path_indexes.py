@@ -0,0 +1,63 @@
+"""add_hot_path_indexes
+
+Revision ID: c4f8e2a6b1d9
+Revises: 9e4b6d2a7c13
+Create Date: 2026-10-18 16:52:08.337415
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4f8e2a6b1d9'
+down_revision = '9e4b6d2a7c13'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns, unique) for every hot lookup
+INDEXES = [
+    ('uq_prayer_times_masjid_id_date', 'prayer_times', ['masjid_id', 'date'], True),
+    ('ix_locations_masjid_id', 'locations', ['masjid_id'], False),
+    ('ix_facilities_masjid_id', 'facilities', ['masjid_id'], False),
+    ('ix_announcements_masjid_id', 'announcements', ['masjid_id'], False),
+    ('ix_special_prayers_masjid_id', 'special_prayers', ['masjid_id'], False),
+    ('ix_logs_masjid_id_action_time', 'logs', ['masjid_id', 'action_time'], False),
+    ('uq_users_email', 'users', ['email'], True),
+    ('ix_config_config_option', 'config', ['config_option'], False),
+]
+
+
+def check_no_duplicates(table, columns):
+    """Fails early with the offending keys instead of leaving an INVALID unique index behind."""
+    key = ', '.join(f'"{column}"' for column in columns)
+    duplicates = op.get_bind().execute(sa.text(
+        f'SELECT {key}, count(*) FROM {table} GROUP BY {key} HAVING count(*) > 1 LIMIT 10'
+    )).all()
+    if duplicates:
+        raise RuntimeError(f'Duplicate {table} ({key}) rows must be removed first: {duplicates}')
+
+
+def upgrade():
+    for _, table, columns, unique in INDEXES:
+        if unique and not op.get_context().as_sql:
+            check_no_duplicates(table, columns)
+
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique in INDEXES:
+            op.create_index(name, table, columns, unique=unique, postgresql_concurrently=True, if_not_exists=True)
+
+    # Promote the unique index to a constraint, this only takes a brief lock
+    op.execute(
+        'ALTER TABLE prayer_times ADD CONSTRAINT uq_prayer_times_masjid_id_date '
+        'UNIQUE USING INDEX uq_prayer_times_masjid_id_date'
+    )
+
+
+def downgrade():
+    op.drop_constraint('uq_prayer_times_masjid_id_date', 'prayer_times', type_='unique')
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in INDEXES:
+            if name != 'uq_prayer_times_masjid_id_date':
+                op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
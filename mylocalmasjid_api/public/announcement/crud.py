@@ -1,8 +1,10 @@
 from fastapi import Depends, HTTPException, status
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from mylocalmasjid_api.database import get_session
+from mylocalmasjid_api.database import get_async_session, get_session
 from mylocalmasjid_api.public.announcement.models import Announcement, AnnouncementCreate
+from mylocalmasjid_api.utils.http_cache import invalidate
 
 
 def add_announcement(masjid_id: str, announcement: AnnouncementCreate, db: Session = Depends(get_session)):
@@ -23,16 +25,12 @@ def add_announcement(masjid_id: str, announcement: AnnouncementCreate, db: Sessi
     db.add(db_announcement)
     db.commit()
     db.refresh(db_announcement)
+    invalidate("announcement", db_announcement.masjid_id)
     return db_announcement
 
 # Add in filter for date_issued and date_expired
-def get_masjid_announcements(masjid_id: str, db: Session = Depends(get_session)):
-    masjid_announcements = db.exec(select(Announcement).where(Announcement.masjid_id == masjid_id)).all()
-    if masjid_announcements is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"No announcements found for masjid with id: {masjid_id}",
-        )
+async def get_masjid_announcements_async(masjid_id: str, db: AsyncSession = Depends(get_async_session)):
+    masjid_announcements = (await db.exec(select(Announcement).where(Announcement.masjid_id == masjid_id))).all()
     return masjid_announcements
 
 
@@ -60,4 +58,5 @@ def update_masjid_announcement(id:str, announcement: Announcement, db: Session =
     db.add(announcement_to_update)
     db.commit()
     db.refresh(announcement_to_update)
+    invalidate("announcement", announcement_to_update.masjid_id)
     return announcement_to_update
@@ -8,7 +8,7 @@ from sqlmodel import Field, SQLModel
 class AnnouncementBase(SQLModel):
     __tablename__ = 'announcements'
 
-    masjid_id: uuid.UUID = Field(foreign_key="masjids.id", nullable=True)
+    masjid_id: uuid.UUID = Field(foreign_key="masjids.id", nullable=True, index=True)
 
     date_issued: date
 
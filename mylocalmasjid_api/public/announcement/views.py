@@ -1,28 +1,30 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from mylocalmasjid_api.database import get_session
+from mylocalmasjid_api.database import get_async_session, get_session
 from mylocalmasjid_api.public.announcement.crud import (
     add_announcement,
-    get_masjid_announcements,
+    get_masjid_announcements_async,
     update_masjid_announcement,
 )
 from mylocalmasjid_api.public.announcement.models import Announcement, AnnouncementCreate
+from mylocalmasjid_api.utils.http_cache import cached_route
 from mylocalmasjid_api.utils.logger import logger_config
 
 from mylocalmasjid_api.auth.authenticate import auth_access_wrapper
 from mylocalmasjid_api.auth.utils import check_user_masjid_update_privileges
 
-router = APIRouter()
+router = APIRouter(route_class=cached_route("announcement"))
 
 logger = logger_config(__name__)
 
 
 @router.get("", response_model=List[Announcement])
-def get_a_masjid_announcements(masjid_id: str, db: Session = Depends(get_session)):
+async def get_a_masjid_announcements(masjid_id: str, db: AsyncSession = Depends(get_async_session)):
     logger.info("%s.get_a_masjid_announcements: %s", __name__, db)
-    return get_masjid_announcements(masjid_id=masjid_id, db=db)
+    return await get_masjid_announcements_async(masjid_id=masjid_id, db=db)
 
 
 @router.patch("/{announcement_id}", response_model=Announcement)
@@ -1,12 +1,64 @@
 from fastapi import Depends, HTTPException, status
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from mylocalmasjid_api.database import get_session
-from mylocalmasjid_api.public.config.models import Config, ConfigCreate
+from mylocalmasjid_api.config import settings
+from mylocalmasjid_api.database import get_async_session, get_session
+from mylocalmasjid_api.public.config.models import Config, ConfigCreate, ConfigOption
+from mylocalmasjid_api.utils.config_snapshot import ConfigSnapshot
+from mylocalmasjid_api.utils.http_cache import invalidate
 
+config_snapshot = ConfigSnapshot(
+    ttl=settings.CONFIG_SNAPSHOT_TTL,
+    types={ConfigOption.hijri_adjustment: int},
+)
 
-def get_config(db: Session = Depends(get_session)):
-    config_options = db.exec(select(Config)).all()
+
+def invalidate_config_responses():
+    invalidate("config")
+    # Prayer times carry Hijri dates, which depend on the hijri_adjustment option
+    invalidate("prayer_times")
+
+
+def load_config_snapshot(db: Session):
+    """Reloads config_snapshot from the config table."""
+    # Copies, so the snapshot is not expired by commits on this session
+    config_snapshot.load(Config.model_validate(option) for option in db.exec(select(Config)).all())
+
+
+async def load_config_snapshot_async(db: AsyncSession):
+    config_snapshot.load(Config.model_validate(option) for option in (await db.exec(select(Config))).all())
+
+
+def get_config_options(db: Session) -> list[Config]:
+    config_options = config_snapshot.options()
+    if config_options is None:
+        load_config_snapshot(db)
+        config_options = config_snapshot.options()
+    return config_options
+
+
+async def get_config_options_async(db: AsyncSession) -> list[Config]:
+    config_options = config_snapshot.options()
+    if config_options is None:
+        await load_config_snapshot_async(db)
+        config_options = config_snapshot.options()
+    return config_options
+
+
+def get_config_value(option: ConfigOption, default=None, db: Session = Depends(get_session)):
+    """Typed value of a config option, served from config_snapshot."""
+    get_config_options(db)
+    return config_snapshot.value(option, default)
+
+
+async def get_config_value_async(option: ConfigOption, default=None, db: AsyncSession = Depends(get_async_session)):
+    await get_config_options_async(db)
+    return config_snapshot.value(option, default)
+
+
+async def get_config_async(db: AsyncSession = Depends(get_async_session)):
+    config_options = await get_config_options_async(db)
     if not config_options:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -30,6 +82,8 @@ def update_config_option(id: str, config: ConfigCreate, db: Session = Depends(ge
     db.add(config_option_to_update)
     db.commit()
     db.refresh(config_option_to_update)
+    load_config_snapshot(db)
+    invalidate_config_responses()
     return config_option_to_update
 
 
@@ -39,4 +93,6 @@ def add_config_option(config_option: ConfigCreate, db: Session = Depends(get_ses
     db.add(config_option_to_add)
     db.commit()
     db.refresh(config_option_to_add)
+    load_config_snapshot(db)
+    invalidate_config_responses()
     return config_option_to_add
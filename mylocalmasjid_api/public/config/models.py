@@ -9,7 +9,7 @@ class ConfigOption(str, enum.Enum):
 class ConfigBase(SQLModel):
     __tablename__ = 'config'
 
-    config_option: ConfigOption = Field()
+    config_option: ConfigOption = Field(index=True)
 
     value: str
 
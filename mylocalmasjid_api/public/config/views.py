@@ -1,22 +1,24 @@
 from fastapi import APIRouter, HTTPException, status, Depends
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from mylocalmasjid_api.database import get_session
-from mylocalmasjid_api.public.config.crud import get_config, update_config_option, add_config_option
+from mylocalmasjid_api.database import get_async_session, get_session
+from mylocalmasjid_api.public.config.crud import get_config_async, update_config_option, add_config_option
 from mylocalmasjid_api.public.config.models import Config, ConfigCreate
+from mylocalmasjid_api.utils.http_cache import cached_route
 from mylocalmasjid_api.utils.logger import logger_config
 
 from mylocalmasjid_api.auth.authenticate import auth_access_wrapper
 
-router = APIRouter()
+router = APIRouter(route_class=cached_route("config"))
 
 logger = logger_config(__name__)
 
 
 @router.get("", response_model=list[Config])
-def get_all_options(db: Session = Depends(get_session)):
+async def get_all_options(db: AsyncSession = Depends(get_async_session)):
     logger.info("%s.get_all_options: %s", __name__, "triggered")
-    return get_config(db=db)
+    return await get_config_async(db=db)
 
 
 @router.patch("/config/{config_id}", response_model=ConfigCreate)
@@ -1,10 +1,12 @@
 from fastapi import Depends, HTTPException, status
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from mylocalmasjid_api.database import get_session
+from mylocalmasjid_api.database import get_async_session, get_session
 from mylocalmasjid_api.public.facility.models import Facility, FacilityCreate
-from mylocalmasjid_api.utils.helpers import check_masjid_exists, create_activity_log
+from mylocalmasjid_api.utils.helpers import check_masjid_exists_async, create_activity_log
 from mylocalmasjid_api.public.logs.models import ActionType
+from mylocalmasjid_api.utils.http_cache import invalidate
 from mylocalmasjid_api.auth.models import User
 
 
@@ -14,6 +16,7 @@ def add_facility(facility: FacilityCreate, db: Session = Depends(get_session), u
     db.add(facility_to_add)
     db.commit()
     db.refresh(facility_to_add)
+    invalidate("facility", facility_to_add.masjid_id)
 
     # Create log entry
     if user:
@@ -30,14 +33,9 @@ def add_facility(facility: FacilityCreate, db: Session = Depends(get_session), u
     return facility_to_add
 
 
-def get_masjid_facilities(masjid_id: str, db: Session = Depends(get_session)):
-    check_masjid_exists(masjid_id, db)
-    masjid_facilities = db.exec(select(Facility).where(Facility.masjid_id == masjid_id)).all()
-    if masjid_facilities is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"No facilities found for masjid with id: {masjid_id}",
-        )
+async def get_masjid_facilities_async(masjid_id: str, db: AsyncSession = Depends(get_async_session)):
+    await check_masjid_exists_async(masjid_id, db)
+    masjid_facilities = (await db.exec(select(Facility).where(Facility.masjid_id == masjid_id))).all()
     return masjid_facilities
 
 
@@ -60,6 +58,7 @@ def update_masjid_facility(id: str, facility: Facility, db: Session = Depends(ge
     db.add(facility_to_update)
     db.commit()
     db.refresh(facility_to_update)
+    invalidate("facility", facility_to_update.masjid_id)
 
     # Create log entry
     if user:
@@ -7,7 +7,7 @@ from sqlmodel import Field, SQLModel
 class FacilityBase(SQLModel):
     __tablename__ = 'facilities'
 
-    masjid_id: uuid.UUID = Field(foreign_key="masjids.id", nullable=False)
+    masjid_id: uuid.UUID = Field(foreign_key="masjids.id", nullable=False, index=True)
 
     facility: str
 
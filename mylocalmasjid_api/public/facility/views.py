@@ -1,24 +1,26 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from mylocalmasjid_api.database import get_session
-from mylocalmasjid_api.public.facility.crud import add_facility, get_masjid_facilities, update_masjid_facility
+from mylocalmasjid_api.database import get_async_session, get_session
+from mylocalmasjid_api.public.facility.crud import add_facility, get_masjid_facilities_async, update_masjid_facility
 from mylocalmasjid_api.public.facility.models import Facility, FacilityCreate
+from mylocalmasjid_api.utils.http_cache import cached_route
 from mylocalmasjid_api.utils.logger import logger_config
 
 from mylocalmasjid_api.auth.authenticate import auth_access_wrapper
 from mylocalmasjid_api.auth.utils import check_user_masjid_update_privileges
 
-router = APIRouter()
+router = APIRouter(route_class=cached_route("facility"))
 
 logger = logger_config(__name__)
 
 
 @router.get("", response_model=List[Facility])
-def get_a_masjid_facilities(masjid_id: str, db: Session = Depends(get_session)):
+async def get_a_masjid_facilities(masjid_id: str, db: AsyncSession = Depends(get_async_session)):
     logger.info("%s.get_a_masjid_facilities: %s", __name__, db)
-    return get_masjid_facilities(masjid_id=masjid_id, db=db)
+    return await get_masjid_facilities_async(masjid_id=masjid_id, db=db)
 
 
 @router.patch("/{facility_id}", response_model=Facility)
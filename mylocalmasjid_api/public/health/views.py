@@ -2,8 +2,11 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlmodel import Session, select
 import sentry_sdk
 
-from mylocalmasjid_api.database import get_session
+from mylocalmasjid_api.auth.authenticate import auth_access_wrapper
+from mylocalmasjid_api.database import async_engine, engine, get_session
 from mylocalmasjid_api.public.config.models import Config
+from mylocalmasjid_api.utils.cache import cache_stats
+from mylocalmasjid_api.utils.db_pool import pool_status
 
 router = APIRouter()
 
@@ -17,7 +20,7 @@ def health_check(db: Session = Depends(get_session)):
         "status": "healthy",
         "database": "healthy",
         "sentry": "healthy",
-        "details": {}
+        "details": {},
     }
     
     # Check database connection
@@ -48,4 +51,24 @@ def health_check(db: Session = Depends(get_session)):
             detail=health_status
         )
     
-    return health_status 
\ No newline at end of file
+    return health_status 
+
+
+@router.get("/metrics")
+def metrics(user_request=Depends(auth_access_wrapper)):
+    """
+    Connection pool and in-process cache metrics of this process. Admins only.
+    """
+    if user_request.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not authorized to view metrics",
+        )
+
+    return {
+        "pools": {
+            "sync": pool_status(engine),
+            "async": pool_status(async_engine.sync_engine),
+        },
+        "caches": cache_stats(),
+    }
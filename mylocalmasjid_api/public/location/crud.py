@@ -1,13 +1,68 @@
+import threading
+
+import numpy as np
 from fastapi import Depends, HTTPException, status
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from mylocalmasjid_api.database import get_session
-from mylocalmasjid_api.public.location.models import Location, LocationCreate
+from mylocalmasjid_api.config import settings
+from mylocalmasjid_api.database import engine, get_async_session, get_session
+from mylocalmasjid_api.public.location.models import Location, LocationCreate, NearestLocationRead
+from mylocalmasjid_api.public.masjid.models import Masjid
+from mylocalmasjid_api.utils.geo import bounding_box, haversine_km
 from mylocalmasjid_api.utils.helpers import check_masjid_exists
+from mylocalmasjid_api.utils.http_cache import invalidate
 from mylocalmasjid_api.utils.logger import logger_config
+from mylocalmasjid_api.utils.spatial_index import SpatialIndex
 
 logger = logger_config(__name__)
 
+# First bounding box searched for nearest masjids, doubled until enough are found
+INITIAL_SEARCH_RADIUS_KM = 5.0
+
+# location id -> location fields, for locations of active masjids
+location_index = SpatialIndex(ttl=settings.LOCATION_INDEX_TTL)
+
+
+def load_location_index():
+    """Loads every location of an active masjid into location_index."""
+    try:
+        with Session(engine) as db:
+            locations = db.exec(
+                select(Location).join(Masjid, Masjid.id == Location.masjid_id).where(Masjid.active == True)
+            ).all()
+            location_index.load(
+                (location.id, location.latitude, location.longitude, location.model_dump())
+                for location in locations
+            )
+        logger.info("%s.load_location_index: %s locations", __name__, len(location_index))
+    except Exception:
+        location_index.cancel_loading()
+        logger.exception("%s.load_location_index: failed", __name__)
+
+
+def _warm_location_index():
+    if location_index.start_loading():
+        threading.Thread(target=load_location_index, daemon=True).start()
+
+
+def index_location(location: Location, db: Session):
+    """Adds, moves or drops a location in location_index after a write."""
+    masjid = db.get(Masjid, location.masjid_id) if location.masjid_id else None
+    if masjid and masjid.active:
+        location_index.upsert(location.id, location.latitude, location.longitude, location.model_dump())
+    else:
+        location_index.remove(location.id)
+
+
+def index_masjid_locations(masjid: Masjid, db: Session):
+    """Brings location_index in line with a masjid's active flag after it is updated."""
+    if not masjid.active:
+        location_index.remove_where(lambda location: location["masjid_id"] == masjid.id)
+        return
+    for location in db.exec(select(Location).where(Location.masjid_id == masjid.id)).all():
+        location_index.upsert(location.id, location.latitude, location.longitude, location.model_dump())
+
 
 def create_location(masjid_location: LocationCreate, db: Session = Depends(get_session)):
     location_to_db = LocationCreate.model_validate(masjid_location)
@@ -22,13 +77,75 @@ def create_location(masjid_location: LocationCreate, db: Session = Depends(get_s
     db.add(db_location)
     db.commit()
     db.refresh(db_location)
+    index_location(db_location, db)
+    invalidate("location", db_location.masjid_id)
+    # Calculated prayer times are worked out from the coordinates
+    invalidate("prayer_times", db_location.masjid_id)
     return db_location
 
 
+def _locations_in_box(lat: float, lon: float, radius_km: float, db: Session) -> list:
+    min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+    query = (
+        select(Location)
+        .join(Masjid, Masjid.id == Location.masjid_id)
+        .where(Masjid.active == True)
+        .where(Location.latitude >= min_lat, Location.latitude <= max_lat)
+    )
+    if min_lon is not None:
+        query = query.where(Location.longitude >= min_lon, Location.longitude <= max_lon)
+    return db.exec(query).all()
+
+
+def _nearest_from_db(lat: float, lon: float, limit: int, radius_km: float, db: Session) -> list:
+    search_radius = min(INITIAL_SEARCH_RADIUS_KM, radius_km)
+    while True:
+        candidates = _locations_in_box(lat, lon, search_radius, db)
+        distances = haversine_km(
+            lat,
+            lon,
+            np.array([location.latitude for location in candidates], dtype=np.float64),
+            np.array([location.longitude for location in candidates], dtype=np.float64),
+        )
+        found = [
+            (distance, location.model_dump())
+            for distance, location in zip(distances.tolist(), candidates)
+            if distance <= search_radius
+        ]
+        if len(found) >= limit or search_radius >= radius_km:
+            break
+        search_radius = min(search_radius * 2, radius_km)
+
+    found.sort(key=lambda item: item[0])
+    return found[:limit]
+
+
 # Find nearest locations to lat lon
-def nearest_location(lat: float, lon: float, db: Session = Depends(get_session)):
-    pass
-    # return masjids
+def nearest_location(
+    lat: float,
+    lon: float,
+    db: Session = Depends(get_session),
+    limit: int = 10,
+    radius_km: float = 50.0,
+) -> list[NearestLocationRead]:
+    """
+    Finds up to limit locations of active masjids within radius_km, nearest first.
+
+    Answered from the in-process location_index when it is warm. While it is cold (or
+    stale) the index is reloaded in the background and the query goes to the database:
+    candidates are pruned with a lat/lon bounding box (served by the locations lat/lon
+    index) which starts small and doubles until limit matches are found or the box
+    reaches radius_km, and only the candidates are ranked by haversine distance.
+    """
+    found = location_index.nearest(lat, lon, limit, radius_km)
+    if found is None:
+        _warm_location_index()
+        found = _nearest_from_db(lat, lon, limit, radius_km, db)
+
+    return [
+        NearestLocationRead(**location, distance_km=round(distance, 3))
+        for distance, location in found
+    ]
 
 
 def get_masjid_location(masjid_id: str, db: Session = Depends(get_session)):
@@ -41,6 +158,16 @@ def get_masjid_location(masjid_id: str, db: Session = Depends(get_session)):
     return masjid_location
 
 
+async def get_masjid_location_async(masjid_id: str, db: AsyncSession = Depends(get_async_session)):
+    masjid_location = (await db.exec(select(Location).where(Location.masjid_id == masjid_id))).first()
+    if not masjid_location:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Masjid not found with id: {masjid_id}",
+        )
+    return masjid_location
+
+
 def update_masjid_location(id:str, location: Location, db: Session = Depends(get_session)):
     location_to_update = db.exec(select(Location).where(Location.id == id)).first()
     if not location_to_update:
@@ -56,4 +183,8 @@ def update_masjid_location(id:str, location: Location, db: Session = Depends(get
     db.add(location_to_update)
     db.commit()
     db.refresh(location_to_update)
+    index_location(location_to_update, db)
+    invalidate("location", location_to_update.masjid_id)
+    # Calculated prayer times are worked out from the coordinates
+    invalidate("prayer_times", location_to_update.masjid_id)
     return location_to_update
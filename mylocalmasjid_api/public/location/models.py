@@ -1,12 +1,12 @@
 import uuid
 
-from sqlalchemy import PrimaryKeyConstraint
+from sqlalchemy import Index, PrimaryKeyConstraint
 from sqlmodel import Field, SQLModel
 
 
 class LocationBase(SQLModel):
     __tablename__ = 'locations'
-    masjid_id: uuid.UUID = Field(foreign_key="masjids.id", nullable=True)
+    masjid_id: uuid.UUID = Field(foreign_key="masjids.id", nullable=True, index=True)
     geoHash: str
     city: str
     country: str
@@ -15,6 +15,7 @@ class LocationBase(SQLModel):
     longitude: float
     __table_args__ = (
         PrimaryKeyConstraint("id"),
+        Index("ix_locations_latitude_longitude", "latitude", "longitude"),
         {},
     )
     class Config:
@@ -37,3 +38,8 @@ class Location(LocationBase, table=True):
 
 class LocationCreate(LocationBase):
     pass
+
+
+class NearestLocationRead(LocationBase):
+    id: uuid.UUID
+    distance_km: float
@@ -1,23 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from mylocalmasjid_api.database import get_session
-from mylocalmasjid_api.public.location.crud import create_location, get_masjid_location, update_masjid_location
+from mylocalmasjid_api.database import get_async_session, get_session
+from mylocalmasjid_api.public.location.crud import create_location, get_masjid_location_async, update_masjid_location
 from mylocalmasjid_api.public.location.models import Location, LocationCreate
+from mylocalmasjid_api.utils.http_cache import cached_route
 from mylocalmasjid_api.utils.logger import logger_config
 
 from mylocalmasjid_api.auth.authenticate import auth_access_wrapper
 from mylocalmasjid_api.auth.utils import check_user_masjid_update_privileges
 
-router = APIRouter()
+router = APIRouter(route_class=cached_route("location"))
 
 logger = logger_config(__name__)
 
 
 @router.get("", response_model=Location)
-def get_a_masjid_location(masjid_id: str, db: Session = Depends(get_session)):
+async def get_a_masjid_location(masjid_id: str, db: AsyncSession = Depends(get_async_session)):
     logger.info("%s.get_a_masjid_location: %s", __name__, db)
-    return get_masjid_location(masjid_id=masjid_id, db=db)
+    return await get_masjid_location_async(masjid_id=masjid_id, db=db)
 
 
 @router.patch("/{location_id}", response_model=Location)
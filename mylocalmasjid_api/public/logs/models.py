@@ -3,6 +3,7 @@ import enum
 from datetime import datetime
 from typing import Optional
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
@@ -39,6 +40,9 @@ class LogBase(SQLModel):
 
 class Log(LogBase, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    __table_args__ = (
+        Index("ix_logs_masjid_id_action_time", "masjid_id", "action_time"),
+    )
 
 
 class LogCreate(LogBase):
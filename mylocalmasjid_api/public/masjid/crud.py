@@ -1,9 +1,18 @@
+import base64
+import binascii
+import json
+import uuid
+
 from fastapi import Depends, HTTPException, status
+from sqlalchemy import and_, func, literal, tuple_
 from sqlmodel import Session, select, or_
 from typing import Optional
 
 from mylocalmasjid_api.database import get_session
+from mylocalmasjid_api.public.location.crud import index_masjid_locations
 from mylocalmasjid_api.public.masjid.models import Masjid, MasjidCreate, MasjidUpdate, PaginatedMasjids
+from mylocalmasjid_api.utils.helpers import invalidate_masjid
+from mylocalmasjid_api.utils.http_cache import MASJID_SCOPE, invalidate
 
 
 def create_masjid(masjid: MasjidCreate, db: Session = Depends(get_session)):
@@ -11,9 +20,26 @@ def create_masjid(masjid: MasjidCreate, db: Session = Depends(get_session)):
     db.add(masjid_to_db)
     db.commit()
     db.refresh(masjid_to_db)
+    invalidate_masjid(masjid_to_db.id)
     return masjid_to_db
 
 
+def encode_masjid_cursor(masjid: Masjid, rank: Optional[float] = None) -> str:
+    """Opaque keyset cursor pointing after masjid in (rank, name, id) order."""
+    return base64.urlsafe_b64encode(json.dumps([rank, masjid.name, str(masjid.id)]).encode()).decode()
+
+
+def decode_masjid_cursor(cursor: str) -> tuple:
+    try:
+        rank, name, masjid_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return rank, name, uuid.UUID(masjid_id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid cursor: {cursor}",
+        )
+
+
 def read_masjids(
     search: str = "",
     type_filter: Optional[str] = None,
@@ -23,9 +49,19 @@ def read_masjids(
     size: int = 20,
     db: Session = Depends(get_session),
     user = None,
+    cursor: Optional[str] = None,
 ) -> PaginatedMasjids:
+    """
+    Pages through masjids ordered by (name, id), or by search relevance first when searching.
+
+    search matches substrings of name, type, locale and madhab, and also names with a word
+    similar to it (pg_trgm word similarity), so prefixes and typos still find the masjid.
+    Passing cursor (a previous page's next_cursor) switches from OFFSET paging to keyset
+    paging, which reads only the requested page however deep it is.
+    """
     # Start with base query
     query = select(Masjid)
+    rank = None
     
     # Filter based on user permissions
     if not user:
@@ -48,9 +84,11 @@ def read_masjids(
                 Masjid.name.ilike(f"%{search}%"),
                 Masjid.type.ilike(f"%{search}%"),
                 Masjid.locale.ilike(f"%{search}%"),
-                Masjid.madhab.ilike(f"%{search}%")
+                Masjid.madhab.ilike(f"%{search}%"),
+                literal(search).op("<%")(Masjid.name),
             )
         )
+        rank = func.word_similarity(search, Masjid.name)
     
     # Apply specific filters if provided
     if type_filter:
@@ -61,23 +99,40 @@ def read_masjids(
         query = query.filter(Masjid.locale == locale_filter)
     
     # Get total count for pagination
-    total = len(db.exec(query).all())
+    total = db.exec(query.with_only_columns(func.count(Masjid.id)).order_by(None)).one()
     total_pages = (total + size - 1) // size if total > 0 else 0
-    
-    # Apply pagination
-    offset = (page - 1) * size
-    query = query.offset(offset).limit(size)
-    
+
+    # Apply pagination, one extra row tells whether there is a next page
+    if rank is not None:
+        query = query.add_columns(rank).order_by(rank.desc(), Masjid.name, Masjid.id)
+    else:
+        query = query.order_by(Masjid.name, Masjid.id)
+    if cursor:
+        cursor_rank, cursor_name, cursor_id = decode_masjid_cursor(cursor)
+        after_cursor = tuple_(Masjid.name, Masjid.id) > (cursor_name, cursor_id)
+        if rank is not None and cursor_rank is not None:
+            after_cursor = or_(rank < cursor_rank, and_(rank == cursor_rank, after_cursor))
+        query = query.where(after_cursor)
+    else:
+        query = query.offset((page - 1) * size)
+    query = query.limit(size + 1)
+
     # Execute query
-    masjids = db.exec(query).all()
-    
+    rows = db.exec(query).all()
+    if rank is not None:
+        masjids, ranks = [row[0] for row in rows], [row[1] for row in rows]
+    else:
+        masjids, ranks = rows, [None] * len(rows)
+    next_cursor = encode_masjid_cursor(masjids[size - 1], ranks[size - 1]) if len(masjids) > size else None
+
     # Return paginated response
     return PaginatedMasjids(
-        items=masjids,
+        items=masjids[:size],
         total=total,
         page=page,
         size=size,
-        pages=total_pages
+        pages=total_pages,
+        next_cursor=next_cursor,
     )
 
 
@@ -106,6 +161,10 @@ def update_masjid(masjid_id: str, masjid: MasjidUpdate, db: Session = Depends(ge
     db.add(masjid_id)
     db.commit()
     db.refresh(masjid_id)
+    # Deactivating a masjid must drop every cached public read for it
+    invalidate_masjid(masjid_id.id)
+    invalidate(MASJID_SCOPE, masjid_id.id)
+    index_masjid_locations(masjid_id, db)
     return masjid_id
 
 
@@ -1,6 +1,7 @@
 import uuid
 from typing import Optional, List
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
@@ -30,6 +31,18 @@ class MasjidBase(SQLModel):
 
 class Masjid(MasjidBase, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    __table_args__ = (
+        # Trigram index serving search (ILIKE, typo tolerant and prefix matches), needs pg_trgm
+        Index(
+            "ix_masjids_search_trgm",
+            "name",
+            "type",
+            "locale",
+            "madhab",
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops" for column in ("name", "type", "locale", "madhab")},
+        ),
+    )
 
 
 class MasjidCreate(MasjidBase):
@@ -53,3 +66,5 @@ class PaginatedMasjids(SQLModel):
     page: int
     size: int
     pages: int
+    # Pass as cursor to fetch the following page, None on the last page
+    next_cursor: Optional[str] = None
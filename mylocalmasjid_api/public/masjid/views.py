@@ -6,9 +6,13 @@ from mylocalmasjid_api.database import get_session
 from mylocalmasjid_api.public.announcement import views as announcement_api
 from mylocalmasjid_api.public.facility import views as facility_api
 from mylocalmasjid_api.public.location import views as location_api
+from mylocalmasjid_api.public.location.crud import nearest_location
+from mylocalmasjid_api.public.location.models import NearestLocationRead
 from mylocalmasjid_api.public.masjid.crud import create_masjid, read_masjid, read_masjids, update_masjid
 from mylocalmasjid_api.public.masjid.models import MasjidCreate, MasjidRead, MasjidUpdate, PaginatedMasjids
 from mylocalmasjid_api.public.prayer_times import views as prayer_times_api
+from mylocalmasjid_api.public.prayer_times.crud import parse_local_time, read_next_jamaats_near
+from mylocalmasjid_api.public.prayer_times.models import NearbyJamaatsRead
 from mylocalmasjid_api.public.special_prayer import views as special_prayers_api
 from mylocalmasjid_api.utils.logger import logger_config
 
@@ -28,6 +32,7 @@ def get_masjids(
     locale_filter: Optional[str] = None,
     page: int = Query(default=1, gt=0),
     size: int = Query(default=20, gt=0, le=100),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_session),
     user_request=Depends(auth_access_wrapper),
 ):
@@ -44,10 +49,39 @@ def get_masjids(
         page=page,
         size=size,
         db=db,
-        user=user_request
+        user=user_request,
+        cursor=cursor,
     )
 
 
+@router.get("/nearest", response_model=list[NearestLocationRead])
+def get_nearest_masjids(
+    lat: float = Query(ge=-90, le=90),
+    lon: float = Query(ge=-180, le=180),
+    limit: int = Query(default=10, gt=0, le=50),
+    radius_km: float = Query(default=50, gt=0, le=500),
+    db: Session = Depends(get_session),
+):
+    logger.info("%s.get_nearest_masjids: %s, %s", __name__, lat, lon)
+    return nearest_location(lat=lat, lon=lon, db=db, limit=limit, radius_km=radius_km)
+
+
+# Next jamaat of each prayer at the nearest masjids. time is a local ISO datetime, defaulting to now.
+@router.get("/nearest/jamaats", response_model=list[NearbyJamaatsRead])
+def get_nearest_jamaats(
+    lat: float = Query(ge=-90, le=90),
+    lon: float = Query(ge=-180, le=180),
+    limit: int = Query(default=10, gt=0, le=50),
+    radius_km: float = Query(default=50, gt=0, le=500),
+    time: str = "",
+    timezone: str = "Europe/London",
+    db: Session = Depends(get_session),
+):
+    logger.info("%s.get_nearest_jamaats: %s, %s", __name__, lat, lon)
+    at = parse_local_time(at=time, timezone=timezone)
+    return read_next_jamaats_near(lat=lat, lon=lon, at=at, limit=limit, radius_km=radius_km, db=db)
+
+
 @router.get("/masjid/{masjid_id}", response_model=MasjidRead)
 def get_a_masjid(
     masjid_id: str, 
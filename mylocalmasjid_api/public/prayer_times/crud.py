@@ -1,21 +1,45 @@
-from datetime import date
+import calendar
+import codecs
+import csv
+import io
+import itertools
+import json
+import uuid
+from datetime import date, datetime, time, timedelta
 
+import numpy as np
+import pytz
 from fastapi import Depends, HTTPException, status
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from mylocalmasjid_api.database import get_session
-from mylocalmasjid_api.public.prayer_times.models import PrayerTimes, PrayerTimesRead, PrayerTimesCreate
-from mylocalmasjid_api.utils.helpers import check_masjid_exists
+from mylocalmasjid_api.database import engine, get_async_session, get_session
+from mylocalmasjid_api.public.location.crud import get_masjid_location, nearest_location
+from mylocalmasjid_api.public.prayer_times.models import (
+    CalculatedPrayerTimesRead,
+    NearbyJamaatsRead,
+    NextJamaatRead,
+    PrayerTimes,
+    PrayerTimesCreate,
+    PrayerTimesRead,
+)
+from mylocalmasjid_api.utils.helpers import check_masjid_exists, check_masjid_exists_async
+from mylocalmasjid_api.utils.http_cache import invalidate
 from mylocalmasjid_api.utils.logger import logger_config
 
 from mylocalmasjid_api.utils.hijri_date import HijriDate
-from mylocalmasjid_api.utils.helpers import get_hijri_adjustment
+from mylocalmasjid_api.utils.helpers import get_hijri_adjustment, get_hijri_adjustment_async
+from mylocalmasjid_api.utils.prayer_cache import get_prayer_times
+from mylocalmasjid_api.utils.prayer_calculator import PrayerConf
 
 logger = logger_config(__name__)
 
-def read_prayer_times(masjid_id: str, limit = 1, selected_date: date = None, db: Session = Depends(get_session)):
-    check_masjid_exists(masjid_id, db)
+# Longest span a single range read can cover
+MAX_RANGE_DAYS = 366
 
+def _prayer_times_query(masjid_id: str, limit: int, selected_date: date = None):
     prayer_times_query = select(PrayerTimes).where(PrayerTimes.masjid_id == masjid_id)
     if selected_date:
         prayer_times_query = prayer_times_query\
@@ -23,23 +47,332 @@ def read_prayer_times(masjid_id: str, limit = 1, selected_date: date = None, db:
     else:
         prayer_times_query = prayer_times_query\
             .where(PrayerTimes.date >= date.today())
-    
-    prayer_times = db.exec(prayer_times_query.order_by(PrayerTimes.date).limit(limit)).all()
-    formatted_prayer_times = []
-    adjustment = get_hijri_adjustment(db)
+    return prayer_times_query.order_by(PrayerTimes.date).limit(limit)
 
-    for prayer_time in prayer_times:
-        hijri = HijriDate.writeIslamicDate(date=prayer_time.date, adjustment=adjustment)
 
+def _format_prayer_times(prayer_times: list, adjustment: int) -> list:
+    first_date = prayer_times[0].date
+    hijri_dates = HijriDate.writeIslamicDateRange(
+        first_date, (prayer_times[-1].date - first_date).days + 1, adjustment
+    )
+
+    formatted_prayer_times = []
+    for prayer_time in prayer_times:
         prayer_time = PrayerTimesRead(
             **prayer_time.model_dump(),
-            hijri_date=hijri['string'],
+            hijri_date=hijri_dates.string(hijri_dates.index(prayer_time.date)),
         )
         formatted_prayer_times.append(prayer_time.model_dump())
-    
     return formatted_prayer_times
 
 
+async def read_prayer_times_async(
+    masjid_id: str,
+    limit = 1,
+    selected_date: str = None,
+    db: AsyncSession = Depends(get_async_session),
+):
+    await check_masjid_exists_async(masjid_id, db)
+    try:
+        start_date = date.fromisoformat(selected_date) if selected_date else None
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid date format: {selected_date}",
+        )
+
+    prayer_times = (await db.exec(_prayer_times_query(masjid_id, limit, start_date))).all()
+    if not prayer_times:
+        return []
+
+    return _format_prayer_times(prayer_times, await get_hijri_adjustment_async(db))
+
+
+def parse_date_range(from_date: str = None, to_date: str = None, month: str = None) -> tuple:
+    """Parses either from/to ISO dates or a YYYY-MM month into an inclusive (start, end) pair."""
+    try:
+        if month:
+            month_start = datetime.strptime(month, "%Y-%m").date()
+            start = month_start
+            end = month_start.replace(day=calendar.monthrange(month_start.year, month_start.month)[1])
+        elif from_date:
+            start = date.fromisoformat(from_date)
+            end = date.fromisoformat(to_date) if to_date else start + timedelta(days=MAX_RANGE_DAYS - 1)
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Either from/to or month must be provided",
+            )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid date range format",
+        )
+
+    if end < start or (end - start).days >= MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range must be in order and at most {MAX_RANGE_DAYS} days",
+        )
+    return start, end
+
+
+def encode_prayer_time(prayer_time: PrayerTimes, hijri_dates) -> str:
+    """Encodes a row as PrayerTimesRead JSON without building the model."""
+    row = prayer_time.model_dump()
+    row["hijri_date"] = hijri_dates.string(hijri_dates.index(prayer_time.date))
+    return json.dumps(row, default=str)
+
+
+def read_prayer_times_range(
+    masjid_id: str,
+    start: date,
+    end: date,
+    ndjson: bool = False,
+    db: Session = Depends(get_session),
+):
+    """
+    Validates the request and returns a generator streaming the prayer times between start and end
+    as a JSON array (or NDJSON), encoding rows as they are fetched.
+    """
+    check_masjid_exists(masjid_id, db)
+    adjustment = get_hijri_adjustment(db)
+    hijri_dates = HijriDate.writeIslamicDateRange(start, (end - start).days + 1, adjustment)
+
+    prayer_times_query = select(PrayerTimes)\
+        .where(PrayerTimes.masjid_id == masjid_id)\
+        .where(PrayerTimes.date >= start)\
+        .where(PrayerTimes.date <= end)\
+        .order_by(PrayerTimes.date)\
+        .execution_options(yield_per=100)
+
+    def stream():
+        # The request session is closed before a streamed body is sent, so the rows are read on their own
+        with Session(engine) as session:
+            prayer_times = session.exec(prayer_times_query)
+            if ndjson:
+                for prayer_time in prayer_times:
+                    yield encode_prayer_time(prayer_time, hijri_dates) + "\n"
+                return
+
+            yield "["
+            for index, prayer_time in enumerate(prayer_times):
+                yield ("," if index else "") + encode_prayer_time(prayer_time, hijri_dates)
+            yield "]"
+
+    return stream()
+
+
+# Time columns of a prayer times row, in the order used by the columnar encoding
+TIME_COLUMNS = (
+    "fajr_start",
+    "fajr_jammat",
+    "sunrise",
+    "dhur_start",
+    "dhur_jammat",
+    "asr_start",
+    "asr_start_1",
+    "asr_jammat",
+    "magrib_start",
+    "magrib_jammat",
+    "isha_start",
+    "isha_jammat",
+)
+
+
+def read_prayer_times_columnar(masjid_id: str, start: date, end: date, db: Session = Depends(get_session)) -> dict:
+    """
+    Reads the prayer times between start and end in a compact columnar encoding:
+    day offsets from date_origin, then one array of minutes since midnight per time column.
+    Rows are read as plain column tuples, no models are built.
+    """
+    check_masjid_exists(masjid_id, db)
+    adjustment = get_hijri_adjustment(db)
+
+    prayer_times_query = select(PrayerTimes.date, *(getattr(PrayerTimes, column) for column in TIME_COLUMNS))\
+        .where(PrayerTimes.masjid_id == masjid_id)\
+        .where(PrayerTimes.date >= start)\
+        .where(PrayerTimes.date <= end)\
+        .order_by(PrayerTimes.date)
+
+    origin = start.toordinal()
+    values = [[] for _ in range(len(TIME_COLUMNS) + 1)]
+    for row in db.exec(prayer_times_query):
+        values[0].append(row[0].toordinal() - origin)
+        for column, value in zip(values[1:], row[1:]):
+            column.append(None if value is None else value.hour * 60 + value.minute)
+
+    return {
+        "masjid_id": masjid_id,
+        "date_origin": start.isoformat(),
+        "hijri_start": HijriDate.writeIslamicDate(date=start, adjustment=adjustment)['string'],
+        "columns": ["day", *TIME_COLUMNS],
+        "values": values,
+    }
+
+
+# Calculated start time field -> (madhab index, PrayerTimesTable column)
+CALCULATED_COLUMNS = {
+    "fajr_start": (0, "fajr"),
+    "sunrise": (0, "sherook"),
+    "dhur_start": (0, "dohr"),
+    "asr_start": (0, "asr"),
+    "asr_start_1": (1, "asr"),
+    "magrib_start": (0, "maghreb"),
+    "isha_start": (0, "ishaa"),
+}
+
+
+def calculate_start_times(latitude: float, longitude: float, timezone: str, method: int, days: list) -> list:
+    """Calculates start times for a single location over days. Asr is given for both madhabs."""
+    tz = pytz.timezone(timezone)
+    # Times are calculated in UTC and shifted by each day's offset so DST changes are honoured
+    utc_offsets = np.array([tz.utcoffset(datetime.combine(day, time(12))).total_seconds() for day in days])
+    tables = [
+        get_prayer_times(PrayerConf(longitude, latitude, 0, angle_ref=method, asr_madhab=asr_madhab), days)
+        for asr_madhab in (1, 2)
+    ]
+    columns = {
+        field: tables[madhab].minutes(column, shift=utc_offsets)
+        for field, (madhab, column) in CALCULATED_COLUMNS.items()
+    }
+
+    start_times = []
+    for index in range(len(days)):
+        day_start_times = {}
+        for field, minutes in columns.items():
+            minute = minutes[index]
+            day_start_times[field] = None if np.isnan(minute) else time(int(minute) // 60, int(minute) % 60)
+        start_times.append(day_start_times)
+    return start_times
+
+
+def read_calculated_prayer_times(
+    masjid_id: str,
+    method: int = 2,
+    timezone: str = "Europe/London",
+    limit: int = 1,
+    selected_date: str = None,
+    db: Session = Depends(get_session),
+):
+    check_masjid_exists(masjid_id, db)
+    if timezone not in pytz.all_timezones_set:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown timezone: {timezone}",
+        )
+    try:
+        start_date = date.fromisoformat(selected_date) if selected_date else date.today()
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid date format: {selected_date}",
+        )
+
+    location = get_masjid_location(masjid_id, db=db)
+    adjustment = get_hijri_adjustment(db)
+
+    days = [start_date + timedelta(days=offset) for offset in range(limit)]
+    start_times = calculate_start_times(location.latitude, location.longitude, timezone, method, days)
+
+    hijri_dates = HijriDate.writeIslamicDateRange(start_date, limit, adjustment)
+
+    calculated_prayer_times = []
+    for index, (day, day_start_times) in enumerate(zip(days, start_times)):
+        prayer_time = CalculatedPrayerTimesRead(
+            masjid_id=location.masjid_id,
+            date=day,
+            hijri_date=hijri_dates.string(index),
+            **day_start_times,
+        )
+        calculated_prayer_times.append(prayer_time.model_dump())
+
+    return calculated_prayer_times
+
+
+# Prayer -> jamaat column
+JAMAAT_COLUMNS = {
+    "fajr": "fajr_jammat",
+    "dhur": "dhur_jammat",
+    "asr": "asr_jammat",
+    "magrib": "magrib_jammat",
+    "isha": "isha_jammat",
+}
+
+
+def parse_local_time(at: str = None, timezone: str = "Europe/London") -> datetime:
+    """
+    Parses an ISO datetime into naive local time in timezone, defaulting to now. A datetime
+    with an offset is converted to timezone, one without is taken as already local.
+    """
+    if timezone not in pytz.all_timezones_set:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown timezone: {timezone}",
+        )
+    if not at:
+        return datetime.now(pytz.timezone(timezone)).replace(tzinfo=None)
+    try:
+        local_time = datetime.fromisoformat(at)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid time format: {at}",
+        )
+    if local_time.tzinfo is not None:
+        local_time = local_time.astimezone(pytz.timezone(timezone))
+    return local_time.replace(tzinfo=None)
+
+
+def read_next_jamaats_near(
+    lat: float,
+    lon: float,
+    at: datetime,
+    limit: int = 10,
+    radius_km: float = 50.0,
+    db: Session = Depends(get_session),
+) -> list[NearbyJamaatsRead]:
+    """
+    Nearest masjids to lat/lon with their next jamaat of each prayer after at.
+
+    Uses one nearest location search and one prayer_times query over every masjid found,
+    covering today and tomorrow so prayers already past today roll over.
+    """
+    locations = nearest_location(lat=lat, lon=lon, db=db, limit=limit, radius_km=radius_km)
+    if not locations:
+        return []
+
+    today = at.date()
+    tomorrow = today + timedelta(days=1)
+    rows = db.exec(
+        select(PrayerTimes.masjid_id, PrayerTimes.date, *[getattr(PrayerTimes, column) for column in JAMAAT_COLUMNS.values()])
+        .where(PrayerTimes.masjid_id.in_([location.masjid_id for location in locations]))
+        .where(PrayerTimes.date >= today)
+        .where(PrayerTimes.date <= tomorrow)
+        .where(PrayerTimes.active == True)
+    ).all()
+    # masjid id -> date -> jamaat times in JAMAAT_COLUMNS order
+    timetables = {}
+    for masjid_id, day, *jamaat_times in rows:
+        timetables.setdefault(masjid_id, {})[day] = jamaat_times
+
+    nearby_jamaats = []
+    for location in locations:
+        timetable = timetables.get(location.masjid_id, {})
+        jamaats = []
+        for index, prayer in enumerate(JAMAAT_COLUMNS):
+            for day in (today, tomorrow):
+                jamaat_time = timetable[day][index] if day in timetable else None
+                if jamaat_time is not None and (day > today or jamaat_time >= at.time()):
+                    jamaats.append(NextJamaatRead(prayer=prayer, date=day, time=jamaat_time))
+                    break
+        jamaats.sort(key=lambda jamaat: (jamaat.date, jamaat.time))
+        nearby_jamaats.append(
+            NearbyJamaatsRead(location=location, next_jamaat=jamaats[0] if jamaats else None, jamaats=jamaats)
+        )
+    return nearby_jamaats
+
+
 def update_single_prayer_times(id: str, prayer_times: PrayerTimes, db: Session = Depends(get_session)):
     prayer_times_row = db.exec(
         select(PrayerTimes).where(PrayerTimes.id == id)
@@ -70,34 +403,269 @@ def update_single_prayer_times(id: str, prayer_times: PrayerTimes, db: Session =
     db.add(prayer_times_row)
     db.commit()
     db.refresh(prayer_times_row)
+    invalidate("prayer_times", prayer_times_row.masjid_id)
     return prayer_times_row
 
-def batch_add_prayer_times(masjid_id: str, prayer_times: list[PrayerTimesCreate], db: Session = Depends(get_session)):
-    prayer_times_to_add = []
+def batch_add_prayer_times(
+    masjid_id: str,
+    prayer_times: list[PrayerTimesCreate],
+    upsert: bool = False,
+    db: Session = Depends(get_session),
+):
+    """
+    Adds a batch of prayer times with one existence query and one multi-row INSERT.
 
+    With upsert, dates that already exist are overwritten (ON CONFLICT (masjid_id, date)
+    DO UPDATE) instead of failing the whole batch with a 409.
+    """
+    check_masjid_exists(masjid_id, db)
+    masjid_uuid = uuid.UUID(str(masjid_id))
+
+    rows = []
+    dates = set()
     for prayer_time in prayer_times:
         # Convert both IDs to strings for comparison
         prayer_time_masjid_id = str(prayer_time.masjid_id) if prayer_time.masjid_id else None
-        masjid_id = str(masjid_id) if masjid_id else None
-        if prayer_time_masjid_id != masjid_id:
+        if prayer_time_masjid_id != str(masjid_uuid):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Masjid id in prayer time does not match masjid id in url",
             )
-        exists = db.exec(
-            select(PrayerTimes).where(PrayerTimes.masjid_id == masjid_id).where(PrayerTimes.date == prayer_time.date)
-        ).first()
-        if exists:
+        if prayer_time.date in dates:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Prayer Times Entry is repeated for date: {prayer_time.date}",
+            )
+        dates.add(prayer_time.date)
+        prayer_time.masjid_id = masjid_uuid
+        rows.append({**prayer_time.model_dump(), "id": uuid.uuid4()})
+
+    if not rows:
+        return prayer_times
+
+    if upsert:
+        statement = postgresql.insert(PrayerTimes)
+        statement = statement.on_conflict_do_update(
+            index_elements=[PrayerTimes.masjid_id, PrayerTimes.date],
+            set_={
+                column: statement.excluded[column]
+                for column in rows[0]
+                if column not in ("id", "masjid_id", "date")
+            },
+        )
+    else:
+        existing_dates = db.exec(
+            select(PrayerTimes.date)
+            .where(PrayerTimes.masjid_id == masjid_uuid)
+            .where(PrayerTimes.date.in_(dates))
+            .order_by(PrayerTimes.date)
+        ).all()
+        if existing_dates:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
-                detail=f"Prayer Times Entry already exists for id: {masjid_id} and date: {date}",
+                detail=f"Prayer Times Entry already exists for id: {masjid_id} and dates: "
+                       f"{', '.join(str(day) for day in existing_dates)}",
             )
-        PrayerTimesCreate.model_validate(prayer_time)
-        prayer_time.masjid_id = masjid_id
-        prayer_times_to_add.append(prayer_time)
-    
-    # Only adds if whole operation is successful
-    db.add_all(prayer_times_to_add)
+        statement = insert(PrayerTimes)
+
+    # Only adds if whole operation is successful, rows are sent as multi-row VALUES batches
+    db.execute(statement, rows)
+    db.commit()
+    invalidate("prayer_times", masjid_uuid)
+    return prayer_times
+
+
+# Timetable upload columns, asr_start_1 may be left empty
+TIMETABLE_TIME_COLUMNS = (
+    "fajr_start",
+    "fajr_jammat",
+    "sunrise",
+    "dhur_start",
+    "dhur_jammat",
+    "asr_start",
+    "asr_start_1",
+    "asr_jammat",
+    "magrib_start",
+    "magrib_jammat",
+    "isha_start",
+    "isha_jammat",
+)
+TIMETABLE_OPTIONAL_COLUMNS = ("asr_start_1",)
+STAGING_COLUMNS = ("id", "masjid_id", "date", "active") + TIMETABLE_TIME_COLUMNS
+
+# Rows validated and copied to the staging table at a time
+IMPORT_CHUNK_ROWS = 2000
+
+
+def _timetable_error(line: int, column: str, value: str):
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Invalid {column} on line {int(line)}: {str(value)!r}",
+    )
+
+
+def _parse_time_column(values: np.ndarray, column: str, lines: np.ndarray) -> np.ndarray:
+    """Validates a column of H:MM[:SS] strings at once, returning HH:MM:SS strings."""
+    hours, _, rest = np.char.partition(np.char.strip(values), ":").T
+    stamps = np.char.add("1970-01-01T", np.char.add(np.char.zfill(hours, 2), np.char.add(":", rest)))
+    try:
+        seconds = np.array(stamps, dtype="datetime64[s]")
+        valid = (np.char.str_len(hours) <= 2) & (seconds < np.datetime64("1970-01-02"))
+    except ValueError:
+        seconds, valid = None, np.zeros(len(values), dtype=bool)
+    if not valid.all():
+        # Find the offending row for the error message
+        for offset, stamp in enumerate(stamps.tolist()):
+            try:
+                if len(hours[offset]) > 2 or np.datetime64(stamp, "s") >= np.datetime64("1970-01-02"):
+                    raise ValueError(stamp)
+            except ValueError:
+                raise _timetable_error(lines[offset], column, values[offset])
+    return np.char.partition(np.datetime_as_string(seconds, unit="s"), "T")[:, 2]
+
+
+def _parse_date(value: str) -> np.datetime64:
+    try:
+        return np.datetime64(value, "D")
+    except ValueError:
+        return np.datetime64("NaT")
+
+
+def parse_timetable_chunk(masjid_id: uuid.UUID, rows: list, header: dict, lines: list) -> str:
+    """
+    Validates a chunk of timetable CSV rows column by column and renders them as CSV
+    for COPY into the staging table.
+
+    :param rows: Lists of cell values.
+    :param header: Column name -> cell index.
+    :param lines: File line number of each row, for error messages.
+    """
+    lines = np.array(lines)
+    width = max(header.values()) + 1
+    for offset, row in enumerate(rows):
+        if len(row) < width:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Line {lines[offset]} has {len(row)} columns, expected {width}",
+            )
+    cells = np.array(rows, dtype=str)
+
+    dates = np.char.strip(cells[:, header["date"]])
+    try:
+        parsed = np.array(dates, dtype="datetime64[D]")
+    except ValueError:
+        # Parse one by one to find the rows numpy rejects
+        parsed = np.array([_parse_date(value) for value in dates.tolist()], dtype="datetime64[D]")
+    # Full YYYY-MM-DD only, numpy would also accept YYYY-MM
+    valid = (np.char.str_len(dates) == 10) & ~np.isnat(parsed)
+    if not valid.all():
+        offset = int(np.argmin(valid))
+        raise _timetable_error(lines[offset], "date", dates[offset])
+
+    columns = [
+        np.array([str(uuid.uuid4()) for _ in rows]),
+        np.full(len(rows), str(masjid_id)),
+        dates,
+        np.full(len(rows), "t"),
+    ]
+    for column in TIMETABLE_TIME_COLUMNS:
+        if column not in header:
+            columns.append(np.full(len(rows), ""))
+            continue
+        values = cells[:, header[column]]
+        present = np.char.str_len(np.char.strip(values)) > 0
+        if column not in TIMETABLE_OPTIONAL_COLUMNS and not present.all():
+            offset = int(np.argmin(present))
+            raise _timetable_error(lines[offset], column, values[offset])
+        parsed = np.full(len(rows), "", dtype="<U8")
+        if present.any():
+            parsed[present] = _parse_time_column(values[present], column, lines[present])
+        columns.append(parsed)
+
+    # Empty unquoted CSV fields are loaded as NULL
+    return "".join(",".join(line) + "\n" for line in zip(*(column.tolist() for column in columns)))
+
+
+def import_prayer_times_csv(masjid_id: str, file, upsert: bool = False, db: Session = Depends(get_session)) -> int:
+    """
+    Imports a timetable CSV (header row with date and the PrayerTimesCreate time columns).
+
+    The file is read and validated in chunks of IMPORT_CHUNK_ROWS, each chunk is COPYed
+    into a temporary staging table, and the staging table is merged into prayer_times in
+    one statement, so memory stays flat whatever the file size. Without upsert the import
+    is rejected if any date already has times.
+
+    :param file: Binary file object.
+    :return: Number of rows imported.
+    """
+    check_masjid_exists(masjid_id, db)
+    masjid_uuid = uuid.UUID(str(masjid_id))
+
+    reader = csv.reader(codecs.iterdecode(file, "utf-8-sig"))
+    header_row = [name.strip().lower() for name in next(reader, [])]
+    header = {name: index for index, name in enumerate(header_row)}
+    missing = [
+        column for column in ("date",) + TIMETABLE_TIME_COLUMNS
+        if column not in header and column not in TIMETABLE_OPTIONAL_COLUMNS
+    ]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Missing columns: {', '.join(missing)}",
+        )
+
+    with db.connection().connection.cursor() as cursor:
+        cursor.execute(
+            "CREATE TEMP TABLE prayer_times_staging (LIKE prayer_times INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+        copy_sql = f"COPY prayer_times_staging ({', '.join(STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+
+        # (file line number, cells) of every row after the header
+        numbered_rows = ((reader.line_num, row) for row in reader)
+        imported = 0
+        while True:
+            chunk = list(itertools.islice(numbered_rows, IMPORT_CHUNK_ROWS))
+            if not chunk:
+                break
+            # Blank rows are skipped, a chunk of only blank rows is not the end of the file
+            chunk = [(line, row) for line, row in chunk if any(cell.strip() for cell in row)]
+            if not chunk:
+                continue
+            lines, rows = zip(*chunk)
+            chunk_csv = parse_timetable_chunk(masjid_uuid, list(rows), header, list(lines))
+            cursor.copy_expert(copy_sql, io.StringIO(chunk_csv))
+            imported += len(rows)
+
+        cursor.execute(
+            "SELECT date FROM prayer_times_staging GROUP BY date HAVING count(*) > 1 ORDER BY date LIMIT 10"
+        )
+        repeated = [str(row[0]) for row in cursor.fetchall()]
+        if repeated:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Prayer Times Entry is repeated for dates: {', '.join(repeated)}",
+            )
+
+        columns = ", ".join(STAGING_COLUMNS)
+        if upsert:
+            updates = ", ".join(f"{column} = excluded.{column}" for column in STAGING_COLUMNS[3:])
+            conflict = f"ON CONFLICT (masjid_id, date) DO UPDATE SET {updates}"
+        else:
+            cursor.execute(
+                "SELECT staging.date FROM prayer_times_staging staging "
+                "JOIN prayer_times ON prayer_times.masjid_id = staging.masjid_id AND prayer_times.date = staging.date "
+                "ORDER BY staging.date LIMIT 10"
+            )
+            existing_dates = [str(row[0]) for row in cursor.fetchall()]
+            if existing_dates:
+                db.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Prayer Times Entry already exists for id: {masjid_id} and dates: {', '.join(existing_dates)}",
+                )
+            conflict = ""
+        cursor.execute(f"INSERT INTO prayer_times ({columns}) SELECT {columns} FROM prayer_times_staging {conflict}")
     db.commit()
-    db.refresh(prayer_times_to_add)
-    return prayer_times_to_add
+    invalidate("prayer_times", masjid_uuid)
+    return imported
@@ -2,8 +2,11 @@ import datetime
 import uuid
 from typing import Optional
 
+from sqlalchemy import UniqueConstraint
 from sqlmodel import Field, SQLModel
 
+from mylocalmasjid_api.public.location.models import NearestLocationRead
+
 
 # TODO - Add Optionals to all fields
 # TODO - OnDelete Cascade
@@ -63,6 +66,10 @@ class PrayerTimesBase(SQLModel):
 
 class PrayerTimes(PrayerTimesBase, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    __table_args__ = (
+        # One timetable row per masjid per day, also serves (masjid_id, date range) lookups
+        UniqueConstraint("masjid_id", "date", name="uq_prayer_times_masjid_id_date"),
+    )
 
 
 class PrayerTimesRead(PrayerTimesBase):
@@ -71,3 +78,58 @@ class PrayerTimesRead(PrayerTimesBase):
 
 class PrayerTimesCreate(PrayerTimesBase):
     pass
+
+
+class PrayerTimesColumnarRead(SQLModel):
+    masjid_id: uuid.UUID
+
+    # Day offsets in values[0] count from this date
+    date_origin: datetime.date
+
+    hijri_start: str
+
+    # "day" then the time columns, in the order of values
+    columns: list[str]
+
+    # Minutes since midnight per time column, None where a time is not set
+    values: list[list[Optional[int]]]
+
+
+class CalculatedPrayerTimesRead(SQLModel):
+    masjid_id: uuid.UUID
+
+    date: datetime.date
+
+    fajr_start: Optional[datetime.time]
+
+    sunrise: Optional[datetime.time]
+
+    dhur_start: Optional[datetime.time]
+
+    asr_start: Optional[datetime.time]
+
+    asr_start_1: Optional[datetime.time]
+
+    magrib_start: Optional[datetime.time]
+
+    isha_start: Optional[datetime.time]
+
+    hijri_date: str
+
+
+class NextJamaatRead(SQLModel):
+    prayer: str
+
+    date: datetime.date
+
+    time: datetime.time
+
+
+class NearbyJamaatsRead(SQLModel):
+    location: NearestLocationRead
+
+    # Soonest of jamaats, None when the masjid has no upcoming times
+    next_jamaat: Optional[NextJamaatRead]
+
+    # Next jamaat of each prayer, in time order
+    jamaats: list[NextJamaatRead]
@@ -1,32 +1,105 @@
-from fastapi import APIRouter, Depends, Query, HTTPException, status
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query, UploadFile
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from mylocalmasjid_api.database import get_session
+from mylocalmasjid_api.database import get_async_session, get_session
 from mylocalmasjid_api.public.prayer_times.crud import (
     batch_add_prayer_times,
-    read_prayer_times,
+    import_prayer_times_csv,
+    parse_date_range,
+    read_calculated_prayer_times,
+    read_prayer_times_async,
+    read_prayer_times_columnar,
+    read_prayer_times_range,
     update_single_prayer_times,
 )
-from mylocalmasjid_api.public.prayer_times.models import PrayerTimes, PrayerTimesRead, PrayerTimesCreate
+from mylocalmasjid_api.public.prayer_times.models import (
+    CalculatedPrayerTimesRead,
+    PrayerTimes,
+    PrayerTimesColumnarRead,
+    PrayerTimesCreate,
+    PrayerTimesRead,
+)
+from mylocalmasjid_api.utils.prayer_calculator import LIST_FAJR_ISHA_METHODS
+from mylocalmasjid_api.utils.http_cache import cached_route
 from mylocalmasjid_api.utils.logger import logger_config
 
 from mylocalmasjid_api.auth.authenticate import auth_access_wrapper
 from mylocalmasjid_api.auth.utils import check_user_masjid_update_privileges
 
-router = APIRouter()
+# The default (no date) prayer times are today's
+router = APIRouter(route_class=cached_route("prayer_times", daily=True))
 
 logger = logger_config(__name__)
 
 
 @router.get("", response_model=list[PrayerTimesRead])
-def get_prayer_times(
+async def get_prayer_times(
     masjid_id: str = "",
     date: str = "",
     limit: int = Query(default=1, lte=1),
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
 ):
     logger.info("%s.get_prayer_times: triggered", __name__)
-    return read_prayer_times(masjid_id=masjid_id, selected_date=date, limit=limit, db=db)
+    return await read_prayer_times_async(masjid_id=masjid_id, selected_date=date, limit=limit, db=db)
+
+
+# Timetable for a date range (from/to) or a whole month (YYYY-MM), streamed as it is read.
+@router.get("/range", response_model=list[PrayerTimesRead])
+def get_prayer_times_range(
+    masjid_id: str = "",
+    from_date: str = Query(default="", alias="from"),
+    to_date: str = Query(default="", alias="to"),
+    month: str = "",
+    format: Literal["json", "ndjson"] = "json",
+    db: Session = Depends(get_session),
+):
+    logger.info("%s.get_prayer_times_range: triggered", __name__)
+    start, end = parse_date_range(from_date=from_date, to_date=to_date, month=month)
+    ndjson = format == "ndjson"
+    return StreamingResponse(
+        read_prayer_times_range(masjid_id=masjid_id, start=start, end=end, ndjson=ndjson, db=db),
+        media_type="application/x-ndjson" if ndjson else "application/json",
+    )
+
+
+# The same range as one array of minutes since midnight per time column
+@router.get("/range/columnar", response_model=PrayerTimesColumnarRead)
+def get_prayer_times_range_columnar(
+    masjid_id: str = "",
+    from_date: str = Query(default="", alias="from"),
+    to_date: str = Query(default="", alias="to"),
+    month: str = "",
+    db: Session = Depends(get_session),
+):
+    logger.info("%s.get_prayer_times_range_columnar: triggered", __name__)
+    start, end = parse_date_range(from_date=from_date, to_date=to_date, month=month)
+    # Returned as is, the arrays are already JSON and skip response model validation
+    return JSONResponse(read_prayer_times_columnar(masjid_id=masjid_id, start=start, end=end, db=db))
+
+
+# Start times calculated from the masjid location, for masjids without an uploaded timetable
+@router.get("/calculated", response_model=list[CalculatedPrayerTimesRead])
+def get_calculated_prayer_times(
+    masjid_id: str = "",
+    date: str = "",
+    limit: int = Query(default=1, ge=1, le=31),
+    method: int = Query(default=2, ge=1, le=len(LIST_FAJR_ISHA_METHODS)),
+    timezone: str = "Europe/London",
+    db: Session = Depends(get_session),
+):
+    logger.info("%s.get_calculated_prayer_times: triggered", __name__)
+    return read_calculated_prayer_times(
+        masjid_id=masjid_id,
+        method=method,
+        timezone=timezone,
+        limit=limit,
+        selected_date=date,
+        db=db,
+    )
 
 
 @router.patch("/{prayer_times_id}", response_model=PrayerTimes)
@@ -43,14 +116,30 @@ def update_prayer_times(
     return prayer_times
 
 
+# upsert=true overwrites dates that already have times instead of rejecting the batch
 @router.post("/batch", response_model=list[PrayerTimesCreate])
-def batch_add_prayer_times(
+def add_batch_prayer_times(
     masjid_id: str,
     prayer_times: list[PrayerTimesCreate],
+    upsert: bool = False,
     db: Session = Depends(get_session),
     user_request=Depends(auth_access_wrapper),
 ):
-    logger.info("%s.batch_add_prayer_times: triggered", __name__)
-    check_user_masjid_update_privileges(user_request, prayer_times.masjid_id)
-    batch_add_prayer_times(masjid_id=masjid_id, prayer_times=prayer_times, db=db)
-    return prayer_times
+    logger.info("%s.add_batch_prayer_times: triggered", __name__)
+    check_user_masjid_update_privileges(user_request, masjid_id)
+    return batch_add_prayer_times(masjid_id=masjid_id, prayer_times=prayer_times, upsert=upsert, db=db)
+
+
+# Timetable CSV upload: a header row with date and the prayer time columns (H:MM or HH:MM:SS)
+@router.post("/upload")
+def upload_prayer_times(
+    masjid_id: str,
+    file: UploadFile,
+    upsert: bool = False,
+    db: Session = Depends(get_session),
+    user_request=Depends(auth_access_wrapper),
+):
+    logger.info("%s.upload_prayer_times: %s", __name__, file.filename)
+    check_user_masjid_update_privileges(user_request, masjid_id)
+    imported = import_prayer_times_csv(masjid_id=masjid_id, file=file.file, upsert=upsert, db=db)
+    return {"imported": imported}
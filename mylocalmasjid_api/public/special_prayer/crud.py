@@ -1,9 +1,11 @@
 from fastapi import Depends, HTTPException, status
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from mylocalmasjid_api.database import get_session
+from mylocalmasjid_api.database import get_async_session, get_session
 from mylocalmasjid_api.public.special_prayer.models import SpecialPrayer, SpecialPrayerCreate
-from mylocalmasjid_api.utils.helpers import check_masjid_exists
+from mylocalmasjid_api.utils.helpers import check_masjid_exists, check_masjid_exists_async
+from mylocalmasjid_api.utils.http_cache import invalidate
 
 
 def add_special_prayer(masjid_id: str, special_prayer: SpecialPrayerCreate, db: Session = Depends(get_session)):
@@ -24,17 +26,13 @@ def add_special_prayer(masjid_id: str, special_prayer: SpecialPrayerCreate, db:
     db.add(special_prayer_to_add)
     db.commit()
     db.refresh(special_prayer_to_add)
+    invalidate("special_prayer", special_prayer_to_add.masjid_id)
     return special_prayer_to_add
 
 
-def get_masjid_special_prayers(masjid_id: str, db: Session = Depends(get_session)):
-    check_masjid_exists(masjid_id, db)
-    masjid_special_prayers = db.exec(select(SpecialPrayer).where(SpecialPrayer.masjid_id == masjid_id)).all()
-    if masjid_special_prayers is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"No special prayers found for masjid with id: {masjid_id}",
-        )
+async def get_masjid_special_prayers_async(masjid_id: str, db: AsyncSession = Depends(get_async_session)):
+    await check_masjid_exists_async(masjid_id, db)
+    masjid_special_prayers = (await db.exec(select(SpecialPrayer).where(SpecialPrayer.masjid_id == masjid_id))).all()
     return masjid_special_prayers
 
 
@@ -60,4 +58,5 @@ def update_masjid_special_prayer(special_prayer_id: str, special_prayer: Special
     db.add(special_prayer_to_update)
     db.commit()
     db.refresh(special_prayer_to_update)
+    invalidate("special_prayer", special_prayer_to_update.masjid_id)
     return special_prayer_to_update
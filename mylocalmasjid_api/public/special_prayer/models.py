@@ -16,7 +16,7 @@ class PrayerType(str, enum.Enum):
 class SpecialPrayerBase(SQLModel):
     __tablename__ = 'special_prayers'
 
-    masjid_id: uuid.UUID = Field(foreign_key="masjids.id", nullable=True)
+    masjid_id: uuid.UUID = Field(foreign_key="masjids.id", nullable=True, index=True)
 
     # Store dates in a single format
     date_start: Optional[date] = Field(nullable=True)
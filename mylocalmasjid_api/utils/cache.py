@@ -0,0 +1,97 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+# name -> LRUCache, for reporting cache metrics
+registry = {}
+
+
+class LRUCache:
+    """
+    Thread safe in-process cache with bounded size and least recently used eviction.
+    Entries can optionally expire after a time to live.
+
+    Attributes:
+        maxsize (int): Maximum number of entries held before evicting.
+        ttl (float): Default seconds an entry stays valid, None to never expire.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups not found in the cache (or expired).
+        name (str): Name the cache is registered under for metrics, None to not register.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None, name: Optional[str] = None):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.name = name
+        if name is not None:
+            registry[name] = self
+
+    def get(self, key, default=None):
+        """Returns the cached value for key and marks it as recently used."""
+        with self._lock:
+            try:
+                value, expires = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            if expires is not None and expires <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl: Optional[float] = None):
+        """
+        Stores value under key, evicting the least recently used entry when full.
+        ttl overrides the cache default for this entry.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expires = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        """Removes key from the cache and returns its value."""
+        with self._lock:
+            value, _ = self._data.pop(key, (default, None))
+            return value
+
+    def clear(self):
+        """Removes every entry from the cache."""
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and (entry[1] is None or entry[1] > time.monotonic())
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def cache_stats() -> dict:
+    """Size and hit metrics of every registered cache, for the health check."""
+    return {name: cache.stats() for name, cache in registry.items()}
@@ -0,0 +1,67 @@
+import threading
+import time
+from typing import Callable, Optional
+
+
+class ConfigSnapshot:
+    """
+    In-process copy of every config option, so reads never query the config table.
+
+    The snapshot starts empty and goes stale ttl seconds after it was loaded, then
+    options returns None until it is reloaded. Writers reload it after committing, other
+    processes pick the change up once their snapshot expires.
+
+    Attributes:
+        ttl (float): Seconds after a load before the snapshot is stale, None to never expire.
+        types (dict): Config option -> callable converting its stored string value.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, types: Optional[dict] = None):
+        self.ttl = ttl
+        self.types = types or {}
+        self._lock = threading.Lock()
+        self._loaded_at = None
+        self._options = ()
+        self._values = {}
+
+    @property
+    def is_fresh(self) -> bool:
+        loaded_at = self._loaded_at
+        return loaded_at is not None and (self.ttl is None or time.monotonic() - loaded_at < self.ttl)
+
+    def load(self, options):
+        """
+        Replaces the snapshot.
+
+        :param options: Iterable of detached Config rows.
+        """
+        options = tuple(options)
+        values = {option.config_option: option.value for option in options}
+        with self._lock:
+            self._options = options
+            self._values = values
+            self._loaded_at = time.monotonic()
+
+    def clear(self):
+        """Empties the snapshot and marks it stale."""
+        with self._lock:
+            self._options = ()
+            self._values = {}
+            self._loaded_at = None
+
+    def options(self) -> Optional[list]:
+        """Every config row, or None while the snapshot is stale."""
+        if not self.is_fresh:
+            return None
+        return list(self._options)
+
+    def value(self, option, default=None):
+        """
+        Value of option converted with its type from types, or default when it is not set.
+        Callers make sure the snapshot is fresh first.
+        """
+        value = self._values.get(option)
+        if value is None:
+            return default
+        convert: Callable = self.types.get(option, str)
+        return convert(value)
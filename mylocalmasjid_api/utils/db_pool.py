@@ -0,0 +1,116 @@
+import threading
+import time
+import uuid
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+from mylocalmasjid_api.config import settings
+
+
+class PoolMetrics:
+    """
+    Connection checkout statistics for a pool.
+
+    Wait time covers waiting for a free pooled connection plus opening a new one, which
+    with NullPool is every checkout.
+    """
+
+    def __init__(self):
+        self.checkouts = 0
+        self.failures = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, wait: float, failed: bool = False):
+        with self._lock:
+            self.checkouts += 1
+            self.failures += failed
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "failures": self.failures,
+                "avg_wait_ms": round(1000 * self.total_wait / self.checkouts, 3) if self.checkouts else 0.0,
+                "max_wait_ms": round(1000 * self.max_wait, 3),
+            }
+
+
+class CheckoutTimingMixin:
+    """Times every checkout of a SQLAlchemy pool into its PoolMetrics."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            self.metrics.record(time.perf_counter() - start, failed=True)
+            raise
+        self.metrics.record(time.perf_counter() - start)
+        return connection
+
+
+class InstrumentedQueuePool(CheckoutTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+class InstrumentedNullPool(CheckoutTimingMixin, NullPool):
+    pass
+
+
+def engine_options(database_uri: str, asynchronous: bool = False) -> dict:
+    """
+    create_engine keyword arguments for the configured DB_POOL_MODE.
+
+    pooled: a pool per process for long running servers (uvicorn), sized by DB_POOL_SIZE
+    and DB_MAX_OVERFLOW, with pre ping and recycling so dropped connections are replaced.
+
+    external: no pooling in process, for Lambda behind PgBouncer or RDS Proxy. Connections
+    are closed on release, and asyncpg prepared statements are disabled (and named uniquely)
+    as transaction pooling can hand each statement a different server connection.
+    """
+    if settings.DB_POOL_MODE == "external":
+        options = {"poolclass": InstrumentedNullPool}
+        if make_url(database_uri).drivername == "postgresql+asyncpg":
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+            }
+        return options
+
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if asynchronous else InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def pool_status(engine) -> dict:
+    """Pool mode, occupancy and checkout metrics of an engine, for the health check."""
+    pool = engine.pool
+    status = {"pool": type(pool).__name__, "status": pool.status()}
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        status.update(metrics.snapshot())
+    return status
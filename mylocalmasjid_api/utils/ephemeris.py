@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+import threading
+from datetime import date
+
+import numpy as np
+
+# Julian day of 0001-01-01 00:00 (proleptic Gregorian), so that jd = ordinal + offset
+JULIAN_DAY_ORDINAL_OFFSET = 1721424.5
+
+EPHEMERIS_START = date(1900, 1, 1)
+EPHEMERIS_END = date(2100, 12, 31)
+
+
+def dsin(deg):
+    """Sine of an angle (or array of angles) in degrees."""
+    return np.sin(np.radians(deg))
+
+
+def dcos(deg):
+    """Cosine of an angle (or array of angles) in degrees."""
+    return np.cos(np.radians(deg))
+
+
+def sun_declination(jd):
+    """Calculate the sun declination angle for an array of Julian days."""
+    n = jd - 2451544.5
+    epsilon = 23.44 - 0.0000004 * n
+    l = 280.466 + 0.9856474 * n
+    g = 357.528 + 0.9856003 * n
+    lamda = l + 1.915 * dsin(g) + 0.02 * dsin(2 * g)
+    x = dsin(epsilon) * dsin(lamda)
+    return (180 / (4 * np.arctan(1))) * np.arctan(x / np.sqrt(-x * x + 1))
+
+
+def equation_of_time(jd):
+    """Calculate the equation of time (in minutes) for an array of Julian days."""
+    n = jd - 2451544.5
+    g = 357.528 + 0.9856003 * n
+    c = (1.9148 * dsin(g)) + (0.02 * dsin(2 * g)) + (0.0003 * dsin(3 * g))
+    lamda = 280.47 + 0.9856003 * n + c
+    r = (-2.468 * dsin(2 * lamda)) + (0.053 * dsin(4 * lamda)) + (0.0014 * dsin(6 * lamda))
+    return (c + r) * 4
+
+
+class SolarEphemeris:
+    """
+    Precomputed sun declination and equation of time, one entry per day.
+
+    Both only depend on the date, so a single table serves every location. The
+    arrays are built on first use and indexed by day number from the start date.
+
+    Attributes:
+        start (date): First day covered by the table.
+        end (date): Last day covered by the table.
+    """
+
+    def __init__(self, start: date = EPHEMERIS_START, end: date = EPHEMERIS_END):
+        self.start = start
+        self.end = end
+        self._first_ordinal = start.toordinal()
+        self._days = end.toordinal() - self._first_ordinal + 1
+        self._declination = None
+        self._equation_of_time = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        with self._lock:
+            if self._declination is None:
+                jd = np.arange(self._days, dtype=np.float64) + self._first_ordinal + JULIAN_DAY_ORDINAL_OFFSET
+                self._equation_of_time = equation_of_time(jd)
+                self._declination = sun_declination(jd)
+
+    def solar_position(self, dates) -> tuple:
+        """
+        Look up sun declination and equation of time for dates.
+
+        Dates outside the table are calculated directly.
+
+        :param dates: Sequence of date objects.
+        :return: Tuple of (declination, equation of time) NumPy arrays.
+        """
+        index = np.fromiter((d.toordinal() for d in dates), dtype=np.int64) - self._first_ordinal
+        if index.size and (index.min() < 0 or index.max() >= self._days):
+            jd = index + self._first_ordinal + JULIAN_DAY_ORDINAL_OFFSET
+            return sun_declination(jd), equation_of_time(jd)
+
+        if self._declination is None:
+            self._load()
+        return self._declination[index], self._equation_of_time[index]
+
+
+solar_ephemeris = SolarEphemeris()
@@ -0,0 +1,37 @@
+import math
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Length of one degree of latitude in km
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """
+    Great circle distance in km between points in degrees.
+    Works on scalars or NumPy arrays (broadcast against each other).
+    """
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def bounding_box(lat: float, lon: float, radius_km: float) -> tuple:
+    """
+    Smallest lat/lon box containing every point within radius_km of (lat, lon).
+
+    :return: Tuple of (min_lat, max_lat, min_lon, max_lon). The longitude bounds are
+        None when the box covers a pole or crosses the antimeridian.
+    """
+    delta_lat = radius_km / KM_PER_DEGREE
+    min_lat, max_lat = lat - delta_lat, lat + delta_lat
+    if min_lat <= -90 or max_lat >= 90:
+        return max(min_lat, -90.0), min(max_lat, 90.0), None, None
+
+    delta_lon = math.degrees(math.asin(min(math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(lat)), 1.0)))
+    min_lon, max_lon = lon - delta_lon, lon + delta_lon
+    if min_lon < -180 or max_lon > 180:
+        return min_lat, max_lat, None, None
+    return min_lat, max_lat, min_lon, max_lon
@@ -1,41 +1,79 @@
 from fastapi import HTTPException, status
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 import uuid
 
 from mylocalmasjid_api.public.masjid.models import Masjid
-from mylocalmasjid_api.public.config.models import Config
+from mylocalmasjid_api.public.config.crud import get_config_value, get_config_value_async
+from mylocalmasjid_api.public.config.models import ConfigOption
 from mylocalmasjid_api.public.logs.models import LogCreate, ActionType
 from mylocalmasjid_api.public.logs.crud import create_log
 from mylocalmasjid_api.auth.models import User
+from mylocalmasjid_api.config import settings
+from mylocalmasjid_api.utils.cache import LRUCache
 
-def check_masjid_exists(masjid_id: str, db: Session):
+# masjid id -> active flag (None if the masjid does not exist)
+masjid_cache = LRUCache(maxsize=4096, ttl=settings.MASJID_CACHE_TTL, name="masjids")
+_NOT_CACHED = object()
+
+
+def _masjid_uuid(masjid_id) -> uuid.UUID:
     try:
         # Convert string to UUID for comparison
-        masjid_uuid = uuid.UUID(masjid_id) if isinstance(masjid_id, str) else masjid_id
-        masjid_exists = db.exec(select(Masjid).where(Masjid.id == masjid_uuid)).first()
-        if not masjid_exists:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Masjid not found with id: {masjid_id}",
-            )
-        if not masjid_exists.active:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Masjid is not active",
-            )
-        return masjid_exists
+        return uuid.UUID(masjid_id) if isinstance(masjid_id, str) else masjid_id
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid masjid ID format: {masjid_id}",
         )
 
+
+def _check_masjid_active(masjid_id, masjid_active):
+    if masjid_active is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Masjid not found with id: {masjid_id}",
+        )
+    if not masjid_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Masjid is not active",
+        )
+
+
+def check_masjid_exists(masjid_id: str, db: Session):
+    masjid_uuid = _masjid_uuid(masjid_id)
+    masjid_active = masjid_cache.get(masjid_uuid, _NOT_CACHED)
+    if masjid_active is _NOT_CACHED:
+        # None when the masjid does not exist
+        masjid_active = db.exec(select(Masjid.active).where(Masjid.id == masjid_uuid)).first()
+        masjid_cache.set(masjid_uuid, masjid_active)
+
+    _check_masjid_active(masjid_id, masjid_active)
+    return masjid_uuid
+
+
+async def check_masjid_exists_async(masjid_id: str, db: AsyncSession):
+    masjid_uuid = _masjid_uuid(masjid_id)
+    masjid_active = masjid_cache.get(masjid_uuid, _NOT_CACHED)
+    if masjid_active is _NOT_CACHED:
+        masjid_active = (await db.exec(select(Masjid.active).where(Masjid.id == masjid_uuid))).first()
+        masjid_cache.set(masjid_uuid, masjid_active)
+
+    _check_masjid_active(masjid_id, masjid_active)
+    return masjid_uuid
+
+
+def invalidate_masjid(masjid_id):
+    """Drops a masjid from the existence cache after it is created or updated."""
+    masjid_cache.pop(uuid.UUID(masjid_id) if isinstance(masjid_id, str) else masjid_id)
+
 def get_hijri_adjustment(db: Session):
-    adjustment_option = db.exec(select(Config).where(Config.config_option == "hijri_adjustment")).first()
-    if not adjustment_option:
-        return 0
-    
-    return int(adjustment_option.value)
+    return get_config_value(ConfigOption.hijri_adjustment, default=0, db=db)
+
+
+async def get_hijri_adjustment_async(db: AsyncSession):
+    return await get_config_value_async(ConfigOption.hijri_adjustment, default=0, db=db)
 
 def create_activity_log(
     db: Session,
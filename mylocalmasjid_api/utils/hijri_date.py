@@ -1,7 +1,40 @@
-from datetime import datetime, timedelta
+from array import array
+from datetime import date as date_type, datetime, timedelta
 import math
+import threading
 from pydantic import BaseModel
 
+from mylocalmasjid_api.config import settings
+
+WD_NAMES = (
+    "Ahad",
+    "Ithnin",
+    "Thulatha",
+    "Arbaa",
+    "Khams",
+    "Jumuah",
+    "Sabt"
+)
+
+I_MONTH_NAMES = (
+    "Muharram",
+    "Safar",
+    "Rabi'ul Awwal",
+    "Rabi'ul Akhir",
+    "Jumadal Ula",
+    "Jumadal Akhira",
+    "Rajab",
+    "Sha'ban",
+    "Ramadan",
+    "Shawwal",
+    "Dhul Qa'ada",
+    "Dhul Hijja"
+)
+
+# Kuwaiti algorithm constants: mean Islamic year in days and the year boundary shift
+I_YEAR = 10631 / 30
+SHIFT_1 = 8.01 / 60
+
 class IslamicDate(BaseModel):
     day: str
     date: int
@@ -65,11 +98,11 @@ class HijriDate(BaseModel):
         else:
             wd = cls.__gmod(jd + 1, 7) + 1
 
-        iyear = 10631 / 30
+        iyear = I_YEAR
         epochastro = 1948084
         epochcivil = 1948085
 
-        shift1 = 8.01 / 60
+        shift1 = SHIFT_1
 
         z = jd - epochastro
         cyc = math.floor(z / 10631)
@@ -101,39 +134,190 @@ class HijriDate(BaseModel):
         Translates the Gregorian Date into the Hijri Date taking into account the adjustment
         :return:
         """
-        wdNames = [
-            "Ahad",
-            "Ithnin",
-            "Thulatha",
-            "Arbaa",
-            "Khams",
-            "Jumuah",
-            "Sabt"
-        ]
-        iMonthNames = [
-            "Muharram",
-            "Safar",
-            "Rabi'ul Awwal",
-            "Rabi'ul Akhir",
-            "Jumadal Ula",
-            "Jumadal Akhira",
-            "Rajab",
-            "Sha'ban",
-            "Ramadan",
-            "Shawwal",
-            "Dhul Qa'ada",
-            "Dhul Hijja"
-        ]
+        res = hijri_lookup_table.lookup(date, adjustment)
+        if res is not None:
+            return res
 
         iDate = cls.__kuwaiticalendar(date, adjustment)
-        outputIslamicDateString = f"{iDate[5]} {iMonthNames[iDate[6]]} {iDate[7]}"
-        # wdNames[iDate[4]] + ", "
+        outputIslamicDateString = f"{iDate[5]} {I_MONTH_NAMES[iDate[6]]} {iDate[7]}"
+        # WD_NAMES[iDate[4]] + ", "
         res: IslamicDate = {
-            'day': wdNames[iDate[4]],
+            'day': WD_NAMES[iDate[4]],
             'date': iDate[5],
             'year': iDate[7],
-            'month': iMonthNames[iDate[6]],
+            'month': I_MONTH_NAMES[iDate[6]],
             'string': outputIslamicDateString
         }
 
         return res
+
+    @staticmethod
+    def monthLength(month: int, year: int) -> int:
+        """
+        Length of an Islamic month in the Kuwaiti arithmetic calendar
+        :param month: Islamic month, 0 based
+        :param year: Islamic year
+        :return:
+        """
+        # Day of the year each month starts after, as used by __kuwaiticalendar
+        month_offset = lambda m: math.floor(29.5001 * m - 29)
+        if month < 11:
+            return month_offset(month + 2) - month_offset(month + 1)
+
+        cycle_year = year % 30
+        year_length = math.floor((cycle_year + 1) * I_YEAR + SHIFT_1) - math.floor(cycle_year * I_YEAR + SHIFT_1)
+        return year_length - month_offset(12)
+
+    @classmethod
+    def writeIslamicDateRange(cls, start: date_type, days: int, adjustment: int = 0) -> "HijriDateRange":
+        """
+        Translates consecutive Gregorian Dates into Hijri Dates taking into account the adjustment.
+        Served from the lookup table when the range falls inside its window.
+        :return:
+        """
+        hijri_range = hijri_lookup_table.range(start, days, adjustment)
+        if hijri_range is None:
+            hijri_range = cls.walkIslamicDateRange(start, days, adjustment)
+        return hijri_range
+
+    @classmethod
+    def walkIslamicDateRange(cls, start: date_type, days: int, adjustment: int = 0) -> "HijriDateRange":
+        """
+        Translates consecutive Gregorian Dates into Hijri Dates taking into account the adjustment.
+        Only the first date runs the full conversion, each following day advances the Hijri
+        day/month/year counters.
+        :return:
+        """
+        hijri_range = HijriDateRange(start)
+        if days <= 0:
+            return hijri_range
+
+        iDate = cls.__kuwaiticalendar(start, adjustment)
+        weekday, day, month, year = iDate[4], iDate[5], iDate[6], iDate[7]
+        month_length = cls.monthLength(month, year)
+
+        for _ in range(days):
+            hijri_range.append(weekday, day, month, year)
+            weekday = (weekday + 1) % 7
+            day += 1
+            if day > month_length:
+                day = 1
+                month += 1
+                if month > 11:
+                    month = 0
+                    year += 1
+                month_length = cls.monthLength(month, year)
+
+        return hijri_range
+
+
+class HijriDateRange:
+    """
+    Hijri dates for consecutive Gregorian days, held in compact arrays.
+
+    Entries are materialised as IslamicDate dicts or strings only when accessed.
+
+    Attributes:
+        start (date): Gregorian date of the first entry.
+    """
+
+    def __init__(self, start: date_type, weekdays=None, days=None, months=None, years=None):
+        self.start = start
+        self._weekdays = array('B') if weekdays is None else weekdays
+        self._days = array('B') if days is None else days
+        self._months = array('B') if months is None else months
+        self._years = array('H') if years is None else years
+
+    def append(self, weekday: int, day: int, month: int, year: int):
+        """Adds the next day, month is 0 based."""
+        self._weekdays.append(weekday)
+        self._days.append(day)
+        self._months.append(month)
+        self._years.append(year)
+
+    def __len__(self):
+        return len(self._days)
+
+    def index(self, gregorian_date: date_type) -> int:
+        """Position of a Gregorian date within the range."""
+        return (gregorian_date - self.start).days
+
+    def string(self, index: int) -> str:
+        """Hijri date string for the entry at index, as in writeIslamicDate."""
+        return f"{self._days[index]} {I_MONTH_NAMES[self._months[index]]} {self._years[index]}"
+
+    def __getitem__(self, index: int) -> IslamicDate:
+        res: IslamicDate = {
+            'day': WD_NAMES[self._weekdays[index]],
+            'date': self._days[index],
+            'year': self._years[index],
+            'month': I_MONTH_NAMES[self._months[index]],
+            'string': self.string(index)
+        }
+        return res
+
+
+class HijriLookupTable:
+    """
+    Hijri dates for every day in a window of years around today, built once on first use.
+
+    Entries are computed without adjustment. An adjustment only shifts the Gregorian date
+    the Hijri date is read from (the weekday stays that of the real date), so applying one
+    is an index offset into the table.
+
+    Attributes:
+        years (int): Years covered either side of today, 0 disables the table.
+    """
+
+    def __init__(self, years: int = 5):
+        self.years = years
+        self._first_ordinal = None
+        self._range = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        with self._lock:
+            if self._range is None:
+                start = date_type.today() - timedelta(days=366 * self.years)
+                hijri_range = HijriDate.walkIslamicDateRange(start, 2 * 366 * self.years + 1)
+                self._first_ordinal = start.toordinal()
+                self._range = hijri_range
+
+    def _position(self, gregorian_date: date_type, days: int, adjustment: int):
+        """Table index of a date, or None when the adjusted span falls outside the window."""
+        if not self.years:
+            return None
+        if self._range is None:
+            self._load()
+        index = gregorian_date.toordinal() - self._first_ordinal
+        first, last = min(index, index + adjustment), max(index, index + adjustment) + days - 1
+        if first < 0 or last >= len(self._range):
+            return None
+        return index
+
+    def lookup(self, gregorian_date: date_type, adjustment: int = 0):
+        """Returns the IslamicDate for a date, or None when outside the window."""
+        index = self._position(gregorian_date, 1, adjustment)
+        if index is None:
+            return None
+        res = self._range[index + adjustment]
+        res['day'] = WD_NAMES[self._range._weekdays[index]]
+        return res
+
+    def range(self, start: date_type, days: int, adjustment: int = 0):
+        """Returns a HijriDateRange sliced from the table, or None when outside the window."""
+        index = self._position(start, days, adjustment)
+        if index is None:
+            return None
+        shifted = index + adjustment
+        table = self._range
+        return HijriDateRange(
+            start,
+            weekdays=table._weekdays[index:index + days],
+            days=table._days[shifted:shifted + days],
+            months=table._months[shifted:shifted + days],
+            years=table._years[shifted:shifted + days],
+        )
+
+
+hijri_lookup_table = HijriLookupTable(settings.HIJRI_LOOKUP_YEARS)
@@ -0,0 +1,131 @@
+import hashlib
+import threading
+import time
+from datetime import date, datetime, timedelta
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Callable, Optional
+
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.routing import APIRoute
+
+from mylocalmasjid_api.config import settings
+from mylocalmasjid_api.utils.cache import LRUCache
+
+# Namespace invalidated by masjid changes, covers every cached response for that masjid
+MASJID_SCOPE = "masjid"
+
+# (namespace, full url[, date for daily routes]) -> CachedResponse
+response_cache = LRUCache(maxsize=512, name="responses")
+
+# (namespace, masjid id or None) -> generation, bumped on every write
+_generations = {}
+_generations_lock = threading.Lock()
+
+
+class CachedResponse:
+    """A rendered GET response along with its validators."""
+
+    def __init__(self, body: bytes, media_type: str, generation: tuple, max_age: int):
+        self.body = body
+        self.media_type = media_type
+        self.generation = generation
+        self.etag = f'"{hashlib.sha256(body).hexdigest()}"'
+        self.created = time.time()
+        self.last_modified = formatdate(self.created, usegmt=True)
+        self.expires = time.monotonic() + max_age
+
+
+def invalidate(namespace: str, masjid_id=None):
+    """
+    Invalidates cached responses of a namespace, for one masjid or (without masjid_id) for all.
+    Only affects this process, other instances and CDNs expire by max-age.
+    """
+    key = (namespace, str(masjid_id) if masjid_id else None)
+    with _generations_lock:
+        _generations[key] = _generations.get(key, 0) + 1
+
+
+def _generation(namespace: str, masjid_id: Optional[str]) -> tuple:
+    return (
+        _generations.get((namespace, None), 0),
+        _generations.get((namespace, masjid_id), 0),
+        _generations.get((MASJID_SCOPE, masjid_id), 0),
+    )
+
+
+def _not_modified(request: Request, entry: CachedResponse) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or entry.etag in tags or f"W/{entry.etag}" in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        try:
+            return parsedate_to_datetime(if_modified_since).timestamp() >= int(entry.created)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _seconds_to_midnight() -> int:
+    tomorrow = datetime.combine(date.today() + timedelta(days=1), datetime.min.time())
+    return max(int((tomorrow - datetime.now()).total_seconds()), 1)
+
+
+def cached_route(
+    namespace: str,
+    max_age: int = settings.HTTP_CACHE_MAX_AGE,
+    stale_while_revalidate: int = settings.HTTP_CACHE_STALE_WHILE_REVALIDATE,
+    daily: bool = False,
+) -> type:
+    """
+    Builds an APIRoute class for public read endpoints. GET responses are kept in process
+    for max_age, carry strong ETag/Last-Modified validators and Cache-Control headers,
+    and conditional requests are answered with 304. Use as APIRouter(route_class=...).
+
+    daily is for endpoints whose default answer depends on today's date: responses are
+    cached per date and no cache (here, in clients or CDNs) may keep them past midnight.
+    """
+    def cache_control(lifetime: int) -> str:
+        # Fresh plus stale time never runs past lifetime
+        fresh = min(max_age, lifetime)
+        return f"public, max-age={fresh}, stale-while-revalidate={min(stale_while_revalidate, lifetime - fresh)}"
+
+    class CachedRoute(APIRoute):
+        def get_route_handler(self) -> Callable:
+            route_handler = super().get_route_handler()
+
+            async def cached_route_handler(request: Request) -> Response:
+                if request.method != "GET":
+                    return await route_handler(request)
+
+                masjid_id = request.path_params.get("masjid_id")
+                key = (namespace, str(request.url))
+                lifetime = max_age + stale_while_revalidate
+                if daily:
+                    key += (date.today(),)
+                    lifetime = _seconds_to_midnight()
+                generation = _generation(namespace, masjid_id)
+                entry = response_cache.get(key)
+                if entry is None or entry.generation != generation or entry.expires < time.monotonic():
+                    response = await route_handler(request)
+                    # Streamed bodies are never buffered, they go out without validators
+                    if response.status_code != 200 or isinstance(response, StreamingResponse):
+                        return response
+                    entry = CachedResponse(response.body, response.media_type, generation, min(max_age, lifetime))
+                    response_cache.set(key, entry)
+
+                headers = {
+                    "ETag": entry.etag,
+                    "Last-Modified": entry.last_modified,
+                    "Cache-Control": cache_control(lifetime),
+                }
+                if _not_modified(request, entry):
+                    return Response(status_code=304, headers=headers)
+                return Response(content=entry.body, media_type=entry.media_type, headers=headers)
+
+            return cached_route_handler
+
+    return CachedRoute
@@ -0,0 +1,74 @@
+import numpy as np
+from pyIslam.hijri import HijriDate
+
+from mylocalmasjid_api.utils.cache import LRUCache
+from mylocalmasjid_api.utils.prayer_calculator import (
+    FixedTime,
+    PrayerConf,
+    PrayerTimesTable,
+    compute_prayer_times,
+)
+
+# Coordinates are rounded to 3 decimal places (~110m) when building cache keys
+COORDINATE_PRECISION = 3
+
+# (conf key, correction, date) -> tuple of decimal hours, one per PrayerTimesTable column
+prayer_times_cache = LRUCache(maxsize=20000, name="prayer_times")
+
+# (date, correction) -> pyIslam HijriDate
+hijri_cache = LRUCache(maxsize=4096, name="hijri_dates")
+
+
+def _angle_key(angle):
+    if isinstance(angle, FixedTime):
+        return (angle.all_year_time_hr, angle.ramadan_time_hr)
+    return angle
+
+
+def conf_key(conf: PrayerConf) -> tuple:
+    """Builds the cache key for a prayer configuration."""
+    return (
+        round(conf.latitude, COORDINATE_PRECISION),
+        round(conf.longitude, COORDINATE_PRECISION),
+        conf.timezone,
+        _angle_key(conf.fajr_angle),
+        _angle_key(conf.ishaa_angle),
+        conf.asr_madhab,
+        conf.summer_time,
+    )
+
+
+def get_hijri(day, correction_val=0):
+    """Cached pyIslam Hijri conversion."""
+    key = (day, correction_val)
+    hijri = hijri_cache.get(key)
+    if hijri is None:
+        hijri = HijriDate.get_hijri(day, correction_val)
+        hijri_cache.set(key, hijri)
+    return hijri
+
+
+def get_prayer_times(conf: PrayerConf, dates: list, correction_val: int = 0) -> PrayerTimesTable:
+    """
+    Cached equivalent of compute_prayer_times for a single configuration.
+
+    Days not in the cache are calculated together in one vectorized pass.
+    """
+    dates = list(dates)
+    key = conf_key(conf)
+    rows = [prayer_times_cache.get((key, correction_val, day)) for day in dates]
+    missing = [day for day, row in zip(dates, rows) if row is None]
+    if missing:
+        table = compute_prayer_times(conf, missing, correction_val, get_hijri=get_hijri)
+        columns = [getattr(table, column).tolist() for column in PrayerTimesTable.COLUMNS]
+        computed = dict(zip(missing, zip(*columns)))
+        for day, row in computed.items():
+            prayer_times_cache.set((key, correction_val, day), row)
+        rows = [computed[day] if row is None else row for day, row in zip(dates, rows)]
+
+    columns = zip(*rows) if rows else ((),) * len(PrayerTimesTable.COLUMNS)
+    return PrayerTimesTable(
+        dates,
+        1 if conf.summer_time else 0,
+        **{name: np.array(values, dtype=np.float64) for name, values in zip(PrayerTimesTable.COLUMNS, columns)},
+    )
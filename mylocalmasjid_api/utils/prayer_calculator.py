@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
-from math import pi, atan, sqrt, tan, floor
-from datetime import time, datetime
+from math import floor
+from datetime import time
+
+import numpy as np
 from pyIslam.hijri import HijriDate
-from pyIslam.baselib import dcos, dsin, equation_of_time, gregorian_to_julian
+
+from mylocalmasjid_api.utils.ephemeris import dcos, dsin, solar_ephemeris
 
 class FixedTime:
     """
@@ -149,9 +152,175 @@ class PrayerConf:
         self.ishaa_angle = (method.ishaa_angle + 90.0) if not isinstance(method.ishaa_angle, FixedTime) else method.ishaa_angle
 
 
+def _time_for_angle(angle, latitude, delta):
+    """Calculate hours from Dohr for a sun angle (Fajr, Sherook, Asr, Maghreb, Ishaa)."""
+    s = ((dcos(angle) - dsin(latitude) * dsin(delta)) / (dcos(latitude) * dcos(delta)))
+    return (180 / np.pi * (np.arctan(-s / np.sqrt(-s * s + 1)) + np.pi / 2)) / 15
+
+
+def _asr_angle(latitude, delta, asr_madhab):
+    """Calculate the angle for Asr based on the chosen Madhab (doctrine)."""
+    x = (dsin(latitude) * dsin(delta) + dcos(latitude) * dcos(delta))
+    a = np.arctan(x / np.sqrt(-x * x + 1))
+    x = asr_madhab + (1 / np.tan(a))
+    return 90 - (180 / np.pi) * (np.arctan(x) + 2 * np.arctan(1))
+
+
+class PrayerTimesTable:
+    """
+    Columnar prayer times produced by compute_prayer_times.
+
+    Every column is a NumPy array of decimal hours. For a single PrayerConf the
+    arrays have shape (days,), for a sequence of configurations (confs, days).
+
+    Attributes:
+        dates (list): Dates covered by the table, in order.
+        fajr, sherook, dohr, asr, maghreb, ishaa (np.ndarray): Prayer times.
+        midnight, second_third_of_night, last_third_of_night (np.ndarray): Night divisions.
+    """
+
+    COLUMNS = (
+        "fajr",
+        "sherook",
+        "dohr",
+        "asr",
+        "maghreb",
+        "ishaa",
+        "midnight",
+        "second_third_of_night",
+        "last_third_of_night",
+    )
+
+    def __init__(self, dates, summer_time, **columns):
+        self.dates = dates
+        self._summer_time = summer_time
+        for name in self.COLUMNS:
+            setattr(self, name, columns[name])
+
+    def __len__(self):
+        return len(self.dates)
+
+    def minutes(self, column, shift=0.0):
+        """
+        Get a column as whole minutes since midnight, wrapped to a single day.
+
+        :param column: Name of the column, e.g. "fajr".
+        :param shift: Time shift in seconds, a scalar or an array broadcast over the dates.
+        :return: NumPy float array with the same shape as the column. NaN where the
+            sun never reaches the prayer angle (e.g. Fajr in high latitude summers).
+        """
+        hours = getattr(self, column) + np.asarray(shift) / 3600 + self._summer_time
+        return np.floor(hours * 60) % (24 * 60)
+
+    def times(self, column, shift=0.0):
+        """
+        Get a column of a single configuration table as time objects.
+
+        :param column: Name of the column, e.g. "fajr".
+        :param shift: Time shift in seconds to apply to the calculated times.
+        :return: A list of time objects, one per date.
+        """
+        values = getattr(self, column)
+        if values.ndim != 1:
+            raise ValueError("times() is only available for a single configuration")
+        return [_hours_to_time(float(val), shift, bool(self._summer_time)) for val in values]
+
+
+def _hours_to_time(val, shift, summer_time):
+    """
+    Convert a decimal hour value to a time object.
+
+    :param val: Value in decimal hours.
+    :param shift: Time shift in seconds to apply to the calculated time.
+    :param summer_time: True if summer time is used.
+    :return: A time object representing the calculated time.
+    """
+    if not isinstance(shift, (float, int)):
+        raise ValueError("shift's value must be an int or a float")
+
+    st = 1 if summer_time else 0
+    hours = val + shift / 3600
+    minutes = (hours - floor(hours)) * 60
+    seconds = (minutes - floor(minutes)) * 60
+    hours = floor(hours + st) % 24
+    return time(hours, floor(minutes), floor(seconds))
+
+
+def compute_prayer_times(confs, dates, correction_val=0, solar_position=None, get_hijri=HijriDate.get_hijri):
+    """
+    Calculate prayer times for many dates, and optionally many locations, in one pass.
+
+    :param confs: A PrayerConf, or a sequence of PrayerConf objects (e.g. one per masjid).
+    :param dates: Sequence of dates to calculate prayer times for.
+    :param correction_val: Hijri correction value, used for fixed Ishaa times in Ramadan.
+    :param solar_position: Optional (sun declination, equation of time) arrays for dates,
+        looked up from the shared solar ephemeris table by default.
+    :param get_hijri: Hijri conversion used for the Ramadan check, pyIslam's by default.
+    :return: PrayerTimesTable with one column per prayer.
+    """
+    if correction_val not in range(-2, 3):
+        raise Exception('Correction value exception')
+
+    single = isinstance(confs, PrayerConf)
+    confs = [confs] if single else list(confs)
+    dates = list(dates)
+
+    if solar_position is None:
+        solar_position = solar_ephemeris.solar_position(dates)
+    delta, time_eq = solar_position
+
+    def conf_column(values, dtype=np.float64):
+        return np.array(values, dtype=dtype)[:, np.newaxis]
+
+    latitude = conf_column([c.latitude for c in confs])
+    longitude_difference = conf_column([c.longitude_difference for c in confs])
+    asr_madhab = conf_column([c.asr_madhab for c in confs])
+    sherook_angle = conf_column([c.sherook_angle for c in confs])
+    maghreb_angle = conf_column([c.maghreb_angle for c in confs])
+    fajr_angle = conf_column([c.fajr_angle for c in confs])
+    fixed_ishaa = conf_column([isinstance(c.ishaa_angle, FixedTime) for c in confs], dtype=bool)
+    ishaa_angle = conf_column([np.nan if isinstance(c.ishaa_angle, FixedTime) else c.ishaa_angle for c in confs])
+    summer_time = conf_column([1 if c.summer_time else 0 for c in confs], dtype=np.int64)
+
+    with np.errstate(invalid="ignore"):
+        dohr = 12 + longitude_difference + time_eq / 60
+        fajr = dohr - _time_for_angle(fajr_angle, latitude, delta)
+        sherook = dohr - _time_for_angle(sherook_angle, latitude, delta)
+        asr = dohr + _time_for_angle(_asr_angle(latitude, delta, asr_madhab), latitude, delta)
+        maghreb = dohr + _time_for_angle(maghreb_angle, latitude, delta)
+        ishaa = dohr + _time_for_angle(ishaa_angle, latitude, delta)
+
+    if fixed_ishaa.any():
+        is_ramadan = np.array([get_hijri(d, correction_val).month == 9 for d in dates], dtype=bool)
+        all_year = conf_column([c.ishaa_angle.all_year_time_hr if isinstance(c.ishaa_angle, FixedTime) else np.nan for c in confs])
+        ramadan = conf_column([c.ishaa_angle.ramadan_time_hr if isinstance(c.ishaa_angle, FixedTime) else np.nan for c in confs])
+        ishaa = np.where(fixed_ishaa, maghreb + np.where(is_ramadan, ramadan, all_year), ishaa)
+
+    night = 24.0 - (maghreb - fajr)
+    columns = dict(
+        fajr=fajr,
+        sherook=sherook,
+        dohr=dohr,
+        asr=asr,
+        maghreb=maghreb,
+        ishaa=ishaa,
+        midnight=maghreb + (night / 2.0),
+        second_third_of_night=maghreb + (night / 3.0),
+        last_third_of_night=maghreb + (2 * night / 3.0),
+    )
+
+    if single:
+        columns = {name: values[0] for name, values in columns.items()}
+        summer_time = summer_time[0, 0]
+
+    return PrayerTimesTable(dates, summer_time, **columns)
+
+
 class Prayer:
     """
     A class for calculating prayer times and Qibla direction.
+
+    Thin single-date wrapper over compute_prayer_times.
     """
 
     def __init__(self, conf, dat, correction_val=0):
@@ -164,49 +333,21 @@ class Prayer:
         """
         self._conf = conf
         self._date = dat
-        self._jd = gregorian_to_julian(dat)
-
-        if correction_val not in range(-2, 3):
-            raise Exception('Correction value exception')
-
         self._correction_val = correction_val
+        table = compute_prayer_times(conf, (dat,), correction_val)
+
+        # Prayer times
+        self._dohr_time = float(table.dohr[0])
+        self._fajr_time = float(table.fajr[0])
+        self._sherook_time = float(table.sherook[0])
+        self._asr_time = float(table.asr[0])
+        self._maghreb_time = float(table.maghreb[0])
+        self._ishaa_time = float(table.ishaa[0])
 
-        # Calculate prayer times
-        self._dohr_time = self._get_dohr_time()
-        self._fajr_time = self._get_fajr_time()
-        self._sherook_time = self._get_sherook_time()
-        self._asr_time = self._get_asr_time()
-        self._maghreb_time = self._get_maghreb_time()
-        self._ishaa_time = self._get_ishaa_time()
-
-        # Calculate midnight and thirds of the night
-        self._midnight = self._get_midnight()
-        self._second_third_of_night = self._get_second_third_of_night()
-        self._last_third_of_night = self._get_last_third_of_night()
-
-    def _get_asr_angle(self):
-        """Calculate the angle for Asr based on the chosen Madhab (doctrine)."""
-        delta = self._sun_declination()
-        x = (dsin(self._conf.latitude) * dsin(delta) + dcos(self._conf.latitude) * dcos(delta))
-        a = atan(x / sqrt(-x * x + 1))
-        x = self._conf.asr_madhab + (1 / tan(a))
-        return 90 - (180 / pi) * (atan(x) + 2 * atan(1))
-
-    def _sun_declination(self):
-        """Calculate the sun declination angle."""
-        n = self._jd - 2451544.5
-        epsilon = 23.44 - 0.0000004 * n
-        l = 280.466 + 0.9856474 * n
-        g = 357.528 + 0.9856003 * n
-        lamda = l + 1.915 * dsin(g) + 0.02 * dsin(2 * g)
-        x = dsin(epsilon) * dsin(lamda)
-        return (180 / (4 * atan(1))) * atan(x / sqrt(-x * x + 1))
-
-    def _get_time_for_angle(self, angle):
-        """Calculate times for prayer angles (Fajr, Sherook, Asr, Maghreb, Ishaa)."""
-        delta = self._sun_declination()
-        s = ((dcos(angle) - dsin(self._conf.latitude) * dsin(delta)) / (dcos(self._conf.latitude) * dcos(delta)))
-        return (180 / pi * (atan(-s / sqrt(-s * s + 1)) + pi / 2)) / 15
+        # Midnight and thirds of the night
+        self._midnight = float(table.midnight[0])
+        self._second_third_of_night = float(table.second_third_of_night[0])
+        self._last_third_of_night = float(table.last_third_of_night[0])
 
     def _hours_to_time(self, val, shift):
         """
@@ -216,94 +357,40 @@ class Prayer:
         :param shift: Time shift in seconds to apply to the calculated time.
         :return: A time object representing the calculated time.
         """
-        if not isinstance(shift, (float, int)):
-            raise ValueError("shift's value must be an int or a float")
-        
-        st = 1 if self._conf.summer_time else 0
-        hours = val + shift / 3600
-        minutes = (hours - floor(hours)) * 60
-        seconds = (minutes - floor(minutes)) * 60
-        hours = floor(hours + st) % 24
-        return time(hours, floor(minutes), floor(seconds))
+        return _hours_to_time(val, shift, self._conf.summer_time)
 
     def fajr_time(self, shift=0.0):
         """Get the Fajr time with an optional shift."""
         return self._hours_to_time(self._fajr_time, shift)
 
-    def _get_fajr_time(self):
-        """Calculate the Fajr time."""
-        return self._dohr_time - self._get_time_for_angle(self._conf.fajr_angle)
-
     def sherook_time(self, shift=0.0):
         """Get the Sherook (Sunrise) time with an optional shift."""
         return self._hours_to_time(self._sherook_time, shift)
 
-    def _get_sherook_time(self):
-        """Calculate the Sherook time."""
-        return self._dohr_time - self._get_time_for_angle(self._conf.sherook_angle)
-
     def dohr_time(self, shift=0.0):
         """Get the Dohr (Zenith) time with an optional shift."""
         return self._hours_to_time(self._dohr_time, shift)
 
-    def _get_dohr_time(self):
-        """Calculate the Dohr time (internal use only)."""
-        ld = self._conf.longitude_difference
-        time_eq = equation_of_time(self._jd)
-        duhr_t = 12 + ld + time_eq / 60
-        return duhr_t
-
     def asr_time(self, shift=0.0):
         """Get the Asr time with an optional shift."""
         return self._hours_to_time(self._asr_time, shift)
 
-    def _get_asr_time(self):
-        """Calculate the Asr time."""
-        return self._dohr_time + self._get_time_for_angle(self._get_asr_angle())
-
     def maghreb_time(self, shift=0.0):
         """Get the Maghreb time with an optional shift."""
         return self._hours_to_time(self._maghreb_time, shift)
 
-    def _get_maghreb_time(self):
-        """Calculate the Maghreb time."""
-        return self._dohr_time + self._get_time_for_angle(self._conf.maghreb_angle)
-
     def ishaa_time(self, shift=0.0):
         """Get the Ishaa time with an optional shift."""
         return self._hours_to_time(self._ishaa_time, shift)
 
-    def _get_ishaa_time(self):
-        """Calculate the Ishaa time."""
-        if isinstance(self._conf.ishaa_angle, FixedTime):
-            is_ramadan = HijriDate.get_hijri(self._date, self._correction_val).month == 9
-            time_after_maghreb = self._conf.ishaa_angle.ramadan_time_hr if is_ramadan else self._conf.ishaa_angle.all_year_time_hr
-            ishaa_t = time_after_maghreb + self._dohr_time + self._get_time_for_angle(self._conf.maghreb_angle)
-        else:
-            ishaa_t = self._dohr_time + self._get_time_for_angle(self._conf.ishaa_angle)
-        
-        return ishaa_t
-
     def midnight(self, shift=0.0):
         """Get the midnight time with an optional shift."""
         return self._hours_to_time(self._midnight, shift)
 
-    def _get_midnight(self):
-        """Calculate the midnight time (internal use only)."""
-        return self._maghreb_time + ((24.0 - (self._maghreb_time - self._fajr_time)) / 2.0)
-
     def second_third_of_night(self, shift=0.0):
         """Get the second third of the night time with an optional shift."""
         return self._hours_to_time(self._second_third_of_night, shift)
 
-    def _get_second_third_of_night(self):
-        """Calculate the second third of the night time (internal use only)."""
-        return self._maghreb_time + ((24.0 - (self._maghreb_time - self._fajr_time)) / 3.0)
-
     def last_third_of_night(self, shift=0.0):
         """Get the last third of the night time with an optional shift."""
         return self._hours_to_time(self._last_third_of_night, shift)
-
-    def _get_last_third_of_night(self):
-        """Calculate the last third of the night time (internal use only)."""
-        return self._maghreb_time + (2 * (24.0 - (self._maghreb_time - self._fajr_time)) / 3.0)
\ No newline at end of file
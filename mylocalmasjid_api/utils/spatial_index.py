@@ -0,0 +1,153 @@
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+
+from mylocalmasjid_api.utils.geo import bounding_box, haversine_km
+
+
+class SpatialIndex:
+    """
+    In-process point index for radius and nearest-N queries.
+
+    Points are held in compact arrays sorted by latitude, so a query only looks at the
+    latitude band of its bounding box (two binary searches) before filtering on longitude
+    and ranking the few remaining candidates by haversine distance. Writes replace the
+    arrays (copy on write), queries never take the lock.
+
+    The index starts cold. Until load is called queries return None, letting callers
+    fall back to the database.
+
+    Attributes:
+        ttl (float): Seconds after a load before the index is considered stale, None to never expire.
+    """
+
+    def __init__(self, ttl: Optional[float] = None):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._loading = False
+        self._loaded_at = None
+        self._state = self._build([])
+
+    @staticmethod
+    def _build(points: list) -> tuple:
+        points = sorted(points, key=lambda point: point[1])
+        latitudes = np.array([point[1] for point in points], dtype=np.float64)
+        longitudes = np.array([point[2] for point in points], dtype=np.float64)
+        keys = [point[0] for point in points]
+        values = [point[3] for point in points]
+        return latitudes, longitudes, keys, values
+
+    @property
+    def is_warm(self) -> bool:
+        loaded_at = self._loaded_at
+        return loaded_at is not None and (self.ttl is None or time.monotonic() - loaded_at < self.ttl)
+
+    def __len__(self):
+        return len(self._state[2])
+
+    def load(self, points):
+        """
+        Replaces the whole index.
+
+        :param points: Iterable of (key, latitude, longitude, value) tuples.
+        """
+        state = self._build(list(points))
+        with self._lock:
+            self._state = state
+            self._loaded_at = time.monotonic()
+            self._loading = False
+
+    def start_loading(self) -> bool:
+        """Claims the (single) reload, returns False when one is already running."""
+        with self._lock:
+            if self._loading:
+                return False
+            self._loading = True
+            return True
+
+    def cancel_loading(self):
+        with self._lock:
+            self._loading = False
+
+    def clear(self):
+        """Empties the index and marks it cold."""
+        with self._lock:
+            self._state = self._build([])
+            self._loaded_at = None
+
+    def _position(self, state: tuple, key) -> Optional[int]:
+        try:
+            return state[2].index(key)
+        except ValueError:
+            return None
+
+    def upsert(self, key, latitude: float, longitude: float, value):
+        """Adds or moves a single point, keeping the arrays sorted."""
+        with self._lock:
+            latitudes, longitudes, keys, values = self._state
+            position = self._position(self._state, key)
+            if position is not None:
+                latitudes = np.delete(latitudes, position)
+                longitudes = np.delete(longitudes, position)
+                keys = keys[:position] + keys[position + 1:]
+                values = values[:position] + values[position + 1:]
+            position = int(np.searchsorted(latitudes, latitude))
+            self._state = (
+                np.insert(latitudes, position, latitude),
+                np.insert(longitudes, position, longitude),
+                keys[:position] + [key] + keys[position:],
+                values[:position] + [value] + values[position:],
+            )
+
+    def remove(self, key):
+        """Removes a point if present."""
+        with self._lock:
+            latitudes, longitudes, keys, values = self._state
+            position = self._position(self._state, key)
+            if position is None:
+                return
+            self._state = (
+                np.delete(latitudes, position),
+                np.delete(longitudes, position),
+                keys[:position] + keys[position + 1:],
+                values[:position] + values[position + 1:],
+            )
+
+    def remove_where(self, predicate):
+        """Removes every point whose value matches predicate."""
+        with self._lock:
+            points = [
+                (key, latitude, longitude, value)
+                for latitude, longitude, key, value in zip(*self._state)
+                if not predicate(value)
+            ]
+            self._state = self._build(points)
+
+    def nearest(self, lat: float, lon: float, limit: int, radius_km: float) -> Optional[list]:
+        """
+        Up to limit points within radius_km of (lat, lon), nearest first.
+
+        :return: List of (distance_km, value) tuples, or None while the index is cold.
+        """
+        if not self.is_warm:
+            return None
+
+        latitudes, longitudes, _, values = self._state
+        min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+        start = int(np.searchsorted(latitudes, min_lat, side="left"))
+        end = int(np.searchsorted(latitudes, max_lat, side="right"))
+        candidates = np.arange(start, end)
+        if min_lon is not None:
+            band = longitudes[start:end]
+            candidates = candidates[(band >= min_lon) & (band <= max_lon)]
+
+        distances = haversine_km(lat, lon, latitudes[candidates], longitudes[candidates])
+        within = distances <= radius_km
+        candidates, distances = candidates[within], distances[within]
+        if len(candidates) > limit:
+            nearest = np.argpartition(distances, limit - 1)[:limit]
+            candidates, distances = candidates[nearest], distances[nearest]
+        order = np.argsort(distances, kind="stable")
+        return [(float(distances[i]), values[candidates[i]]) for i in order]
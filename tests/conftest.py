@@ -0,0 +1,43 @@
+import os
+import tempfile
+import uuid
+
+# The app reads its settings on import, default to a throwaway sqlite database
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test.db")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel
+
+from mylocalmasjid_api.app import app
+from mylocalmasjid_api.auth.authenticate import encode_login_token
+from mylocalmasjid_api.auth.models import User
+from mylocalmasjid_api.database import engine
+from mylocalmasjid_api.public.masjid.models import Masjid
+
+
+@pytest.fixture(scope="session")
+def client():
+    SQLModel.metadata.create_all(engine)
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def masjid(client):
+    masjid = Masjid(name="East London Mosque", type="Masjid", locale="English", madhab="Hanafi", website=None, has_times=True)
+    with Session(engine) as session:
+        session.add(masjid)
+        session.commit()
+        session.refresh(masjid)
+    return masjid
+
+
+@pytest.fixture
+def admin_headers(client):
+    user = User(email=f"{uuid.uuid4()}@example.com", role="admin", active=True, full_name="Admin", related_masjid=None, hashed_password="")
+    with Session(engine) as session:
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+    return {"Authorization": f"Bearer {encode_login_token(user=user)['access_token']}"}
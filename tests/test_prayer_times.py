@@ -0,0 +1,36 @@
+import datetime
+
+from sqlmodel import Session
+
+from mylocalmasjid_api.database import engine
+from mylocalmasjid_api.public.prayer_times.models import PrayerTimes
+
+
+def add_prayer_times(masjid, days):
+    start = datetime.time(12, 0)
+    with Session(engine) as session:
+        for day in days:
+            session.add(
+                PrayerTimes(
+                    masjid_id=masjid.id, date=day, fajr_start=start, fajr_jammat=start, sunrise=start,
+                    dhur_start=start, dhur_jammat=start, asr_start=start, asr_start_1=None, asr_jammat=start,
+                    magrib_start=start, magrib_jammat=start, isha_start=start, isha_jammat=start,
+                )
+            )
+        session.commit()
+
+
+def test_prayer_times_from_date(client, masjid):
+    add_prayer_times(masjid, [datetime.date(2024, 1, day) for day in (1, 2, 3)])
+
+    response = client.get(f"/masjids/masjid/{masjid.id}/prayer-times", params={"date": "2024-01-02", "limit": 5})
+
+    assert response.status_code == 200
+    assert [row["date"] for row in response.json()] == ["2024-01-02", "2024-01-03"]
+
+
+def test_prayer_times_invalid_date(client, masjid):
+    response = client.get(f"/masjids/masjid/{masjid.id}/prayer-times", params={"date": "02/01/2024"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid date format: 02/01/2024"
@@ -0,0 +1,48 @@
+import pytest
+from sqlalchemy.engine import make_url
+
+from mylocalmasjid_api.database import engine
+
+COLUMNS = (
+    "date,fajr_start,fajr_jammat,sunrise,dhur_start,dhur_jammat,asr_start,asr_start_1,asr_jammat,"
+    "magrib_start,magrib_jammat,isha_start,isha_jammat"
+)
+
+requires_postgres = pytest.mark.skipif(
+    make_url(str(engine.url)).get_backend_name() != "postgresql", reason="the import COPYs into postgres"
+)
+
+
+def upload(client, masjid, headers, content: bytes, **params):
+    return client.post(
+        f"/masjids/masjid/{masjid.id}/prayer-times/upload",
+        params=params,
+        files={"file": ("timetable.csv", content, "text/csv")},
+        headers=headers,
+    )
+
+
+def test_upload_reads_the_multipart_file(client, masjid, admin_headers):
+    response = upload(client, masjid, admin_headers, b"\xef\xbb\xbfdate,fajr_start\n2024-01-01,06:00\n")
+
+    assert response.status_code == 400
+    assert "Missing columns" in response.json()["detail"]
+    assert "date" not in response.json()["detail"]
+
+
+@requires_postgres
+def test_upload_imports_timetable(client, masjid, admin_headers):
+    rows = "\n".join(
+        f"2024-01-0{day},06:00,06:30,07:45,12:15,13:00,14:00,,14:30,16:10,16:15,17:45,19:30" for day in (1, 2)
+    )
+    content = f"\ufeff{COLUMNS}\n{rows}\n".encode("utf-8")
+
+    response = upload(client, masjid, admin_headers, content)
+    assert response.status_code == 200
+    assert response.json() == {"imported": 2}
+
+    response = upload(client, masjid, admin_headers, content)
+    assert response.status_code == 409
+
+    response = upload(client, masjid, admin_headers, content, upsert=True)
+    assert response.json() == {"imported": 2}